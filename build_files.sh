@@ -7,4 +7,7 @@ pip install -r requirements.txt
 python manage.py migrate --noinput
 
 # Collect static files
-python manage.py collectstatic --noinput
\ No newline at end of file
+python manage.py collectstatic --noinput
+
+# Render the data-free pages to static HTML (served before any view runs)
+python manage.py prerender
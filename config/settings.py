@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
-import dj_database_url
+import tempfile
 from decouple import config
 
 
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'main.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -59,11 +60,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'config.urls'
+# config.asgi switches this to config.urls_async (async listing views)
+ROOT_URLCONF = config('ROOT_URLCONF', default='config.urls')
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'main.templating.InstrumentedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -99,6 +101,18 @@ except ImportError:
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection reuse on the Postgres path. Each worker thread keeps its
+# connection for DB_CONN_MAX_AGE seconds, and it is health-checked before
+# reuse. On Vercel the default is short, because a frozen function's idle
+# connection is likely to have been dropped by the server or a pooler by
+# the time it thaws. With DB_POOL=True (needs psycopg 3 + psycopg_pool)
+# each process keeps a small pool instead of one connection per thread.
+ON_VERCEL = bool(os.getenv("VERCEL"))
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60 if ON_VERCEL else 600, cast=int)
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_STATEMENT_TIMEOUT_MS = config('DB_STATEMENT_TIMEOUT_MS', default=0, cast=int)
+
 if DATABASE_URL:
     # Use PostgreSQL if DATABASE_URL is provided
     tmpPostgres = urlparse(DATABASE_URL)
@@ -109,18 +123,143 @@ if DATABASE_URL:
             'USER': tmpPostgres.username,
             'PASSWORD': tmpPostgres.password,
             'HOST': tmpPostgres.hostname,
-            'PORT': 5432,
+            'PORT': tmpPostgres.port or 5432,
             'OPTIONS': dict(parse_qsl(tmpPostgres.query)),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
         }
     }
+    DATABASES['default']['OPTIONS'].setdefault('connect_timeout', 5)
+    if DB_STATEMENT_TIMEOUT_MS:
+        # Server-side cap, so a query the read budget gave up on does not
+        # keep a worker thread and a backend busy.
+        DATABASES['default']['OPTIONS']['options'] = ' '.join(filter(None, [
+            DATABASES['default']['OPTIONS'].get('options'),
+            f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}',
+        ]))
+    if DB_POOL:
+        from psycopg_pool import ConnectionPool
+
+        # Django manages pooled connections itself; CONN_MAX_AGE must be 0.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': 0 if ON_VERCEL else 1,
+            'max_size': DB_POOL_MAX_SIZE,
+            'max_idle': DB_CONN_MAX_AGE,
+            'timeout': 10,
+            'check': ConnectionPool.check_connection,
+        }
 else:
     # Fallback to SQLite for local development
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Same reuse policy, so check_db_pool can exercise it locally
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            # A file, not the in-memory default: threaded tests then wait on
+            # SQLite's lock instead of failing with "table is locked".
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+# Cache
+# Per-process locmem by default. Cached pages are keyed on the database's
+# ContentVersion, so every worker sees edits; point PAGE_CACHE_DIR at a
+# shared directory to share the pages themselves between workers.
+PAGE_CACHE_DIR = config('PAGE_CACHE_DIR', default='')
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=600, cast=int)
+
+if PAGE_CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': PAGE_CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ai-solutions',
         }
     }
+
+# Rows per page on the keyset-paginated listings (?after=<cursor>)
+LISTING_PAGE_SIZE = config('LISTING_PAGE_SIZE', default=24, cast=int)
+# Featured rows shown above a listing; the same on every page
+FEATURED_LIMIT = config('FEATURED_LIMIT', default=6, cast=int)
+
+# Article view counts are buffered per process and written back in batches
+VIEW_COUNT_FLUSH_INTERVAL = config('VIEW_COUNT_FLUSH_INTERVAL', default=30, cast=int)
+VIEW_COUNT_MAX_PENDING = config('VIEW_COUNT_MAX_PENDING', default=500, cast=int)
+
+# Rendered article detail pages kept per process (least recently used evicted)
+ARTICLE_PAGE_CACHE_SIZE = config('ARTICLE_PAGE_CACHE_SIZE', default=256, cast=int)
+
+# Contact-form inquiries: 'sync' saves inline; 'queued' journals them to
+# INQUIRY_SPILL_DIR and bulk-inserts them from a background thread. The
+# spill dir must be writable and outlive the process: on Vercel only the
+# per-instance /tmp is, so keep 'sync' there. A payload rejected
+# INQUIRY_MAX_ATTEMPTS times is set aside in failed-inquiries.jsonl.
+INQUIRY_INGEST_MODE = config('INQUIRY_INGEST_MODE', default='sync')
+INQUIRY_SPILL_DIR = config(
+    'INQUIRY_SPILL_DIR',
+    default=os.path.join(tempfile.gettempdir(), 'inquiries') if ON_VERCEL else str(BASE_DIR / 'var' / 'inquiries'),
+)
+INQUIRY_MAX_ATTEMPTS = config('INQUIRY_MAX_ATTEMPTS', default=3, cast=int)
+INQUIRY_QUEUE_SIZE = config('INQUIRY_QUEUE_SIZE', default=1000, cast=int)
+INQUIRY_BATCH_SIZE = config('INQUIRY_BATCH_SIZE', default=100, cast=int)
+INQUIRY_FLUSH_INTERVAL = config('INQUIRY_FLUSH_INTERVAL', default=1.0, cast=float)
+
+# Responsive image variants (WebP + JPEG per width), generated off-request
+# in a process pool; set IMAGE_VARIANT_ASYNC=False to generate them inline.
+IMAGE_VARIANT_WIDTHS = (320, 640, 1024, 1600)
+IMAGE_VARIANT_QUALITY = config('IMAGE_VARIANT_QUALITY', default=80, cast=int)
+IMAGE_VARIANT_WORKERS = config('IMAGE_VARIANT_WORKERS', default=2, cast=int)
+IMAGE_VARIANT_ASYNC = config('IMAGE_VARIANT_ASYNC', default=True, cast=bool)
+
+# Public listings are served from an in-memory snapshot of the active rows
+# (main.snapshot), rebuilt when the ContentVersion stamp moves. Workers share
+# the pickled snapshot through CONTENT_SNAPSHOT_DIR, which must be writable
+# and private: it is created 0700, and a directory or file that another user
+# owns or can write to is never unpickled. On Vercel only /tmp is writable.
+CONTENT_SNAPSHOT = config('CONTENT_SNAPSHOT', default=True, cast=bool)
+CONTENT_SNAPSHOT_DIR = config(
+    'CONTENT_SNAPSHOT_DIR',
+    default=os.path.join(tempfile.gettempdir(), 'ai-solutions-snapshot') if ON_VERCEL else str(BASE_DIR / 'var' / 'snapshot'),
+)
+CONTENT_SNAPSHOT_CHECK_SECONDS = config('CONTENT_SNAPSHOT_CHECK_SECONDS', default=5.0, cast=float)
+
+# Resilient reads (main.resilience): each listing read runs on the request's
+# connection under a READ_BUDGET_SECONDS statement timeout (0 disables it).
+# When it fails, the last good copy, up to STALE_MAX_AGE_SECONDS old, is
+# served while the database is probed again every READ_RETRY_SECONDS.
+READ_BUDGET_SECONDS = config('READ_BUDGET_SECONDS', default=3.0, cast=float)
+READ_RETRY_SECONDS = config('READ_RETRY_SECONDS', default=5.0, cast=float)
+STALE_MAX_AGE_SECONDS = config('STALE_MAX_AGE_SECONDS', default=900, cast=int)
+READ_CACHE_SIZE = config('READ_CACHE_SIZE', default=256, cast=int)
+
+# JSON API (/api/<resource>/): default and largest page size, and the
+# Cache-Control max-age of its responses
+API_PAGE_SIZE = config('API_PAGE_SIZE', default=50, cast=int)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=200, cast=int)
+API_CACHE_SECONDS = config('API_CACHE_SECONDS', default=60, cast=int)
+
+# Event registration: seat counts change with every registration, so the
+# listings showing them are refreshed at most once per this many seconds
+# (0 refreshes after each registration)
+SEAT_REFRESH_SECONDS = config('SEAT_REFRESH_SECONDS', default=2.0, cast=float)
+
+# Per-request timing (PerformanceMiddleware): fraction of requests sampled,
+# 0 disables it entirely. Sampled requests get a JSON line on the 'main'
+# logger (a warning above PERF_SLOW_REQUEST_MS), and with PERF_SERVER_TIMING
+# a Server-Timing header. That header shows query counts and timings to
+# anyone, so it is off unless DEBUG.
+PERF_SAMPLE_RATE = config('PERF_SAMPLE_RATE', default=0.0, cast=float)
+PERF_SERVER_TIMING = config('PERF_SERVER_TIMING', default=DEBUG, cast=bool)
+PERF_SLOW_REQUEST_MS = config('PERF_SLOW_REQUEST_MS', default=1000, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -161,6 +300,17 @@ STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Pages without data dependencies, rendered to HTML at build time by
+# `manage.py prerender` and served by WhiteNoise before any view runs.
+# Missing files fall through to the dynamic views, which answer with the
+# prerendered copy if rendering fails; in DEBUG WhiteNoise never serves them,
+# so template edits show up immediately.
+PRERENDERED_PAGES = ['home', 'portfolio', 'articles', 'testimonials']
+PRERENDER_ROOT = os.path.join(STATIC_ROOT, 'prerendered')
+if not DEBUG and os.path.isdir(PRERENDER_ROOT):
+    WHITENOISE_ROOT = PRERENDER_ROOT
+    WHITENOISE_INDEX_FILE = True
+
 # Optional: Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
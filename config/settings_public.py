@@ -0,0 +1,22 @@
+"""
+Settings for the public-site entry point (config.wsgi_public).
+
+Identical to config.settings except that Jazzmin and the admin are not
+installed, so a cold instance serving the public pages never imports them.
+Deployments route /admin/ and /dashboard/ to the full entry point,
+config.wsgi.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS if app not in ('jazzmin', 'django.contrib.admin')
+]
+
+ROOT_URLCONF = 'config.urls_public'
+WSGI_APPLICATION = 'config.wsgi_public.application'
+
+# Flash messages (e.g. after the contact form) ride in a signed cookie, so
+# public requests never have to load a session row.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
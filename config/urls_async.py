@@ -0,0 +1,15 @@
+from django.urls import path
+
+from main import async_views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+# URLconf of the ASGI entry point (config.asgi): config.urls with the async
+# versions of the listing views and the dashboard in front.
+urlpatterns = [
+    path('solutions/', async_views.solutions, name='solutions'),
+    path('testimonials/', async_views.testimonials, name='testimonials'),
+    path('articles/', async_views.articles, name='articles'),
+    path('events/', async_views.events, name='events'),
+    path('dashboard/', async_views.admin_dashboard, name='admin_dashboard'),
+] + sync_urlpatterns
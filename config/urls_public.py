@@ -0,0 +1,12 @@
+from django.urls import path, include
+from django.conf import settings
+from django.conf.urls.static import static
+
+# Public URLconf: everything in main, no admin (see config.settings_public).
+urlpatterns = [
+    path('', include('main.urls')),
+]
+
+# Serve media files during development
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -21,9 +21,12 @@ try:
     application = get_wsgi_application()
     app = application
 except Exception as e:
-    # If there's an error, create a simple error handler
+    # If there's an error, create a simple error handler. Python unbinds
+    # ``e`` when the except block ends, so keep the message instead.
+    message = str(e)
+
     def application(environ, start_response):
         start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
-        return [f'Django WSGI Error: {str(e)}'.encode()]
+        return [f'Django WSGI Error: {message}'.encode()]
     app = application
 
@@ -0,0 +1,30 @@
+"""
+WSGI entry point for the public site.
+
+Runs with config.settings_public, which leaves out Jazzmin and the admin so
+cold starts only import what the public pages need. /admin/ and /dashboard/
+are served by config.wsgi; see vercel.json.
+"""
+
+import os
+import sys
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ['DJANGO_SETTINGS_MODULE'] = 'config.settings_public'
+
+try:
+    application = get_wsgi_application()
+    app = application
+except Exception as e:
+    # If there's an error, create a simple error handler. Python unbinds
+    # ``e`` when the except block ends, so keep the message instead.
+    message = str(e)
+
+    def application(environ, start_response):
+        start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
+        return [f'Django WSGI Error: {message}'.encode()]
+    app = application
@@ -1,20 +1,41 @@
 from django.contrib import admin
+from . import search
+from .exports import export_response
 from .models import (
-    Inquiry, Solution, Event, Article, GalleryImage, 
+    Inquiry, Solution, Event, EventRegistration, Article, GalleryImage, 
     Testimonial, PricingPlan
 )
 
 
+class FullTextSearchMixin:
+    """Answer the changelist search box from the full-text index when available"""
+
+    def get_search_results(self, request, queryset, search_term):
+        matched = search.filter_queryset(queryset, search_term) if search_term else None
+        if matched is None:
+            return super().get_search_results(request, queryset, search_term)
+        return matched, False
+
+
 @admin.register(Inquiry)
 class InquiryAdmin(admin.ModelAdmin):
     list_display = ("full_name", "email", "phone", "company_name", "country", "created_at")
     search_fields = ("full_name", "email", "company_name", "country", "job_title")
     list_filter = ("country", "created_at")
     readonly_fields = ("created_at",)
+    actions = ("export_csv", "export_ndjson")
+
+    @admin.action(description="Export selected inquiries as CSV")
+    def export_csv(self, request, queryset):
+        return export_response(queryset, "csv")
+
+    @admin.action(description="Export selected inquiries as NDJSON")
+    def export_ndjson(self, request, queryset):
+        return export_response(queryset, "ndjson")
 
 
 @admin.register(Solution)
-class SolutionAdmin(admin.ModelAdmin):
+class SolutionAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("title", "category", "is_featured", "is_active", "created_at")
     list_filter = ("category", "is_featured", "is_active", "created_at")
     search_fields = ("title", "description")
@@ -23,17 +44,29 @@ class SolutionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
-    list_display = ("title", "event_type", "date", "location", "price", "is_featured", "is_active")
-    list_filter = ("event_type", "is_featured", "is_active", "date")
+class EventAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = (
+        "title", "event_type", "date", "location", "price", "spots_remaining", "is_featured", "is_active",
+    )
+    list_filter = ("event_type", "is_featured", "is_active", "waitlist_enabled", "date")
     search_fields = ("title", "description", "location")
     list_editable = ("is_featured", "is_active")
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "date"
 
 
+@admin.register(EventRegistration)
+class EventRegistrationAdmin(admin.ModelAdmin):
+    list_display = ("full_name", "email", "event", "status", "created_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("full_name", "email", "event__title")
+    list_select_related = ("event",)
+    raw_id_fields = ("event",)
+    readonly_fields = ("idempotency_key", "created_at")
+
+
 @admin.register(Article)
-class ArticleAdmin(admin.ModelAdmin):
+class ArticleAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("title", "category", "author", "is_featured", "is_published", "published_at")
     list_filter = ("category", "is_featured", "is_published", "published_at")
     search_fields = ("title", "description", "content", "author")
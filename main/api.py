@@ -0,0 +1,220 @@
+"""Read-only JSON API over the public content models (``/api/<resource>/``).
+
+Query parameters:
+
+- ``fields=title,category`` picks the columns to return. Only those (plus the
+  ordering columns the cursor needs) are selected, through ``.values()``, so
+  e.g. ``Article.content`` is never read unless it is asked for.
+- ``after=<cursor>`` pages through the listing, as on the HTML pages.
+- ``limit=`` sets the page size, up to ``API_MAX_PAGE_SIZE``.
+- The resource's choice field filters it, with several values separated by
+  commas, e.g. ``/api/events/?event_type=webinar,workshop``.
+
+JSONFields are read as their stored text and spliced into the response as
+they are, so they are never decoded and re-encoded. Responses carry
+``Cache-Control`` and the same ETag/Last-Modified validators as the HTML
+listings, and are kept in the page cache. While the database is failing, a
+recent copy of each page is served instead (main.resilience).
+"""
+import json
+import logging
+from dataclasses import dataclass
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.functions import Cast
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+
+from .cache import cache_public_page, skip_page_cache
+from .conditional import listing_condition
+from .models import Article, Event, PricingPlan, Solution, Testimonial
+from .pagination import keyset_ordering, keyset_paginate
+from .resilience import read
+
+
+@dataclass(frozen=True)
+class Resource:
+    model: type
+    visible: dict
+    fields: tuple
+    # Returned when ?fields= is absent; large columns are left out.
+    default_fields: tuple = ()
+    filter_field: str = ""
+
+    def queryset(self):
+        return self.model._default_manager.filter(**self.visible)
+
+
+RESOURCES = {
+    "solutions": Resource(
+        Solution, {"is_active": True},
+        fields=(
+            "id", "title", "description", "category", "image", "features", "metrics",
+            "pricing", "is_featured", "created_at", "updated_at",
+        ),
+        filter_field="category",
+    ),
+    "events": Resource(
+        Event, {"is_active": True},
+        fields=(
+            "id", "title", "description", "event_type", "image", "date", "location",
+            "duration", "price", "spots_remaining", "waitlist_enabled",
+            "is_featured", "created_at", "updated_at",
+        ),
+        filter_field="event_type",
+    ),
+    "articles": Resource(
+        Article, {"is_published": True},
+        fields=(
+            "id", "title", "slug", "description", "content", "category", "image", "read_time",
+            "author", "views", "is_featured", "published_at", "updated_at",
+        ),
+        default_fields=(
+            "id", "title", "slug", "description", "category", "image", "read_time",
+            "author", "views", "is_featured", "published_at", "updated_at",
+        ),
+        filter_field="category",
+    ),
+    "testimonials": Resource(
+        Testimonial, {"is_active": True},
+        fields=(
+            "id", "name", "position", "company", "industry", "content", "rating",
+            "avatar_initials", "is_featured", "created_at", "updated_at",
+        ),
+        filter_field="industry",
+    ),
+    "pricing-plans": Resource(
+        PricingPlan, {"is_active": True},
+        fields=("id", "name", "price", "period", "description", "features", "is_popular"),
+    ),
+}
+
+logger = logging.getLogger(__name__)
+
+_encode = DjangoJSONEncoder(separators=(",", ":")).encode
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _requested_fields(resource, params):
+    if not params.get("fields"):
+        return resource.default_fields or resource.fields
+    fields = [name.strip() for name in params["fields"].split(",") if name.strip()]
+    unknown = [name for name in fields if name not in resource.fields]
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(resource.fields)}")
+    return tuple(dict.fromkeys(fields))
+
+
+def _filtered(resource, params):
+    queryset = resource.queryset()
+    if resource.filter_field and params.get(resource.filter_field):
+        values = [value.strip() for value in params[resource.filter_field].split(",") if value.strip()]
+        choices = dict(resource.model._meta.get_field(resource.filter_field).choices)
+        unknown = [value for value in values if value not in choices]
+        if unknown:
+            raise BadRequest(
+                f"Unknown {resource.filter_field}: {', '.join(unknown)}. Available: {', '.join(choices)}"
+            )
+        queryset = queryset.filter(**{f"{resource.filter_field}__in": values})
+    return queryset
+
+
+def _page_size(params):
+    try:
+        limit = int(params.get("limit") or settings.API_PAGE_SIZE)
+    except ValueError:
+        raise BadRequest("limit must be a whole number")
+    return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+
+def _row_encoders(model_class, fields):
+    """``(name, prefix, encode)`` per output field; ``encode`` turns the fetched value into JSON text"""
+    encoders = []
+    for name in fields:
+        field = model_class._meta.get_field(name)
+        prefix = f"{json.dumps(name)}:"
+        if isinstance(field, models.JSONField):
+            # Already JSON text in the database: splice it in untouched.
+            encoders.append((f"{name}_json", prefix, lambda value: "null" if value is None else value))
+        elif isinstance(field, models.FileField):
+            encoders.append((name, prefix, lambda value: _encode(default_storage.url(value) if value else None)))
+        else:
+            encoders.append((name, prefix, _encode))
+    return encoders
+
+
+def render_page(resource, request):
+    params = request.GET
+    fields = _requested_fields(resource, params)
+    queryset = _filtered(resource, params)
+    per_page = _page_size(params)
+
+    json_fields = [
+        name for name in fields if isinstance(resource.model._meta.get_field(name), models.JSONField)
+    ]
+    ordering = [name.lstrip("-") for name in keyset_ordering(resource.model)]
+    selected = [name for name in dict.fromkeys([*fields, *ordering]) if name not in json_fields]
+    queryset = queryset.annotate(
+        **{f"{name}_json": Cast(name, models.TextField()) for name in json_fields}
+    ).values(*selected, *[f"{name}_json" for name in json_fields])
+
+    page = keyset_paginate(queryset, after=params.get("after"), per_page=per_page)
+
+    encoders = _row_encoders(resource.model, fields)
+    rows = ",".join(
+        "{" + ",".join(prefix + encode(row[key]) for key, prefix, encode in encoders) + "}"
+        for row in page
+    )
+    next_url = None
+    if page.has_next:
+        query = params.copy()
+        query["after"] = page.next_cursor
+        next_url = f"{request.path}?{query.urlencode()}"
+    return f'{{"results":[{rows}],"next":{_encode(next_url)}}}'
+
+
+def resource_view(name):
+    """The list view of ``RESOURCES[name]``, with conditional GET and page caching"""
+    resource = RESOURCES[name]
+
+    def view(request):
+        try:
+            # Only the plain first page keeps a fallback; query strings are client-controlled.
+            key = None if request.GET else ("api", name)
+            body = read(key, partial(render_page, resource, request), request)
+        except BadRequest as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error in API {name} view: {str(e)}")
+            skip_page_cache(request)
+            return JsonResponse({"error": "Temporarily unavailable"}, status=503)
+        response = HttpResponse(body, content_type="application/json")
+        patch_cache_control(response, public=True, max_age=settings.API_CACHE_SECONDS)
+        return response
+
+    # cache_public_page keys pages on the view's name and the parameters render_page reads
+    view.__name__ = view.__qualname__ = f"api_{name.replace('-', '_')}"
+    params = ("after", "fields", "limit", *filter(None, [resource.filter_field]))
+    return listing_condition(resource.queryset())(cache_public_page(resource.model, params=params)(view))
+
+
+def api_index(request):
+    """Map of the available resources and their fields"""
+    response = JsonResponse({
+        name: {
+            "url": f"{request.path}{name}/",
+            "fields": list(resource.fields),
+            "filter": resource.filter_field or None,
+        }
+        for name, resource in RESOURCES.items()
+    })
+    patch_cache_control(response, public=True, max_age=settings.API_CACHE_SECONDS)
+    return response
+
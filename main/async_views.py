@@ -0,0 +1,69 @@
+"""Async versions of the listing views and the dashboard, served by config.asgi"""
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from . import views
+from .cache import cache_public_page
+from .conditional import listing_condition
+from .db import run_with_connection_checks
+from .models import Article, Event, PricingPlan, Solution, Testimonial
+
+logger = logging.getLogger(__name__)
+
+
+async def gather_queries(*calls):
+    """Run the sync callables ``calls`` concurrently on worker threads; results in order"""
+    return await asyncio.gather(*(
+        sync_to_async(run_with_connection_checks, thread_sensitive=False)(call) for call in calls
+    ))
+
+
+async def render_listing(request, listing):
+    try:
+        reads = listing.reads(request)
+        results = dict(zip(reads, await gather_queries(*reads.values())))
+        return await sync_to_async(render)(request, listing.template, listing.context(results))
+    except Exception as e:
+        return await sync_to_async(views.listing_failed)(request, listing, e)
+
+
+@listing_condition(
+    Solution.objects.filter(is_active=True),
+    PricingPlan.objects.filter(is_active=True),
+)
+@cache_public_page(Solution, PricingPlan)
+async def solutions(request):
+    return await render_listing(request, views.SOLUTIONS)
+
+
+@listing_condition(Testimonial.objects.filter(is_active=True))
+@cache_public_page(Testimonial)
+async def testimonials(request):
+    return await render_listing(request, views.TESTIMONIALS)
+
+
+@listing_condition(Article.objects.filter(is_published=True))
+@cache_public_page(Article)
+async def articles(request):
+    return await render_listing(request, views.ARTICLES)
+
+
+@listing_condition(Event.objects.filter(is_active=True), vary_on_csrf=True)
+@cache_public_page(Event, vary_on_csrf=True)
+async def events(request):
+    return await render_listing(request, views.EVENTS)
+
+
+@login_required
+async def admin_dashboard(request):
+    try:
+        reads = views.dashboard_reads()
+        context = views.dashboard_context(dict(zip(reads, await gather_queries(*reads.values()))))
+    except Exception as e:
+        logger.error(f"Error in async admin_dashboard view: {str(e)}")
+        context = views.DASHBOARD_FALLBACK
+    return await sync_to_async(render)(request, "main/admin_dashboard.html", context)
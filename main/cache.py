@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+GENERATION_KEY = "main:generation:{}"
+PAGE_KEY = "main:page:{}:{}:{}"
+
+logger = logging.getLogger(__name__)
+
+
+def _generation_key(model_class):
+    return GENERATION_KEY.format(model_class._meta.label_lower)
+
+
+def model_generations(*model_classes):
+    """Return the current generation counter of each model, in order.
+
+    Counters start from a timestamp rather than zero so that an evicted
+    counter can never come back at a value an old cached page was keyed on.
+    """
+    keys = [_generation_key(model_class) for model_class in model_classes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model_class):
+    """Invalidate every cached page that depends on ``model_class``"""
+    key = _generation_key(model_class)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def skip_page_cache(request):
+    """Keep the response for this request out of the page cache (e.g. a degraded fallback)"""
+    request._skip_page_cache = True
+
+
+def has_pending_messages(request):
+    storage = getattr(request, "_messages", None)
+    return storage is not None and len(storage) > 0
+
+
+def cache_public_page(*model_classes, vary_on_csrf=False, params=("after",)):
+    """Cache the full response of an anonymous GET, keyed on the content version.
+
+    ``model_classes`` are the models whose rows the page renders; a save or
+    delete of any of them bumps its generation and the database-backed
+    ``ContentVersion``, either of which retires the cached page. Only the
+    query ``params`` the view reads are part of the key, so arbitrary query
+    strings share one entry. Pages that render a CSRF token must pass
+    ``vary_on_csrf`` so the token baked into the HTML always matches the
+    visitor's cookie. Works on sync and async views alike.
+    """
+    def page_key(request, view_name):
+        """Cache key of the response, or None when it must not be cached"""
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.user.is_authenticated
+            or has_pending_messages(request)
+        ):
+            return None
+
+        csrf_cookie = ""
+        if vary_on_csrf:
+            csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+            if not csrf_cookie:
+                return None
+
+        generations = [str(g) for g in model_generations(*model_classes)]
+        if model_classes:
+            # Imported here: both modules import this one.
+            from .resilience import read
+            from .snapshot import content_version
+
+            try:
+                # Generations live in this process's cache; the version is shared by every worker.
+                generations.append(str(read("content_version", content_version, request)))
+            except DatabaseError as e:
+                logger.error(f"Error reading content version: {str(e)}")
+                return None
+
+        query = urlencode([(name, value) for name in params for value in request.GET.getlist(name)])
+        digest = hashlib.md5(
+            f"{request.path}?{query}|{csrf_cookie}".encode(), usedforsecurity=False
+        ).hexdigest()
+        return PAGE_KEY.format(view_name, digest, ".".join(generations))
+
+    def cacheable(request, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not getattr(request, "_skip_page_cache", False)
+        )
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # The user and message checks may load the session from the database.
+                key = await sync_to_async(page_key)(request, view_func.__name__)
+                if key is None:
+                    return await view_func(request, *args, **kwargs)
+                response = await cache.aget(key)
+                if response is not None:
+                    return response
+                response = await view_func(request, *args, **kwargs)
+                if cacheable(request, response):
+                    await cache.aset(key, response, settings.PAGE_CACHE_TIMEOUT)
+                return response
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = page_key(request, view_func.__name__)
+            if key is None:
+                return view_func(request, *args, **kwargs)
+
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if cacheable(request, response):
+                cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
+
+
+class LocalLRUCache:
+    """Bounded, thread-safe, in-process LRU mapping"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def discard_matching(self, predicate):
+        """Drop every entry whose value satisfies ``predicate``"""
+        with self._lock:
+            for key in [key for key, value in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,91 @@
+import hashlib
+import logging
+from functools import partial, wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import models
+from django.views.decorators.http import condition
+
+from .cache import has_pending_messages
+from .resilience import read
+from .snapshot import listing_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(queryset):
+    """``(count, latest updated_at)`` of ``queryset``, from the content snapshot when it holds it"""
+    snapshot_fingerprint = listing_fingerprint(queryset)
+    if snapshot_fingerprint is not None:
+        return snapshot_fingerprint
+    row = queryset.order_by().aggregate(latest=models.Max("updated_at"), count=models.Count("pk"))
+    return row["count"], row["latest"]
+
+
+def content_validator(querysets, csrf_cookie="", request=None):
+    """Return ``(etag, last_modified)`` for the rows a listing renders.
+
+    One ``Max('updated_at')`` + ``Count`` aggregate per queryset: the count
+    catches deletions, which leave no newer ``updated_at`` behind. Listings
+    held by the content snapshot take both figures from it instead. Reads
+    are budgeted like the views' own (main.resilience).
+    """
+    parts = [csrf_cookie]
+    last_modified = None
+    for queryset in querysets:
+        count, latest = read(
+            ("fingerprint", queryset.model._meta.label_lower, str(queryset.query.where)),
+            partial(fingerprint, queryset),
+            request,
+        )
+        parts.append(f"{queryset.model._meta.label_lower}:{count}:{latest}")
+        if latest and (last_modified is None or latest > last_modified):
+            last_modified = latest
+    etag = hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'"{etag}"', last_modified
+
+
+def listing_condition(*querysets, vary_on_csrf=False):
+    """Answer If-None-Match/If-Modified-Since with a 304 before the view runs.
+
+    The validator is computed once per request and shared by the ETag and
+    Last-Modified checks. Pages rendering a CSRF token fold the visitor's
+    cookie into the ETag so a cached copy never carries a foreign token.
+    """
+    def get_validator(request, *args, **kwargs):
+        if not hasattr(request, "_content_validator"):
+            csrf_cookie = ""
+            if vary_on_csrf:
+                csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+            try:
+                request._content_validator = content_validator(querysets, csrf_cookie, request)
+            except Exception as e:
+                logger.error(f"Error computing content validator: {str(e)}")
+                request._content_validator = (None, None)
+        return request._content_validator
+
+    def decorator(view_func):
+        conditional_view = condition(
+            etag_func=lambda request, *args, **kwargs: get_validator(request)[0],
+            last_modified_func=lambda request, *args, **kwargs: get_validator(request)[1],
+        )(view_func)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # Django's condition() calls the validator synchronously, so
+                # compute it off the event loop first; the call below reuses it.
+                if await sync_to_async(has_pending_messages)(request):
+                    return await view_func(request, *args, **kwargs)
+                await sync_to_async(get_validator)(request)
+                return await conditional_view(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if has_pending_messages(request):
+                return view_func(request, *args, **kwargs)
+            return conditional_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
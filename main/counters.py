@@ -0,0 +1,96 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCounter:
+    """Aggregate per-row increments in memory and write them back in batches.
+
+    Each flush issues one ``UPDATE ... SET field = field + n`` per touched row,
+    so a popular row costs one write per flush instead of one per hit. Counts
+    are flushed when ``max_pending`` increments accumulate, every
+    ``flush_interval`` seconds from a daemon thread, and at interpreter exit.
+    """
+
+    def __init__(self, model_label, field, flush_interval=None, max_pending=None):
+        self.model_label = model_label
+        self.field = field
+        self.flush_interval = flush_interval or settings.VIEW_COUNT_FLUSH_INTERVAL
+        self.max_pending = max_pending or settings.VIEW_COUNT_MAX_PENDING
+        self._pending = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    @property
+    def model_class(self):
+        from django.apps import apps
+
+        return apps.get_model(self.model_label)
+
+    def increment(self, pk, amount=1):
+        with self._lock:
+            self._pending[pk] += amount
+            self._pending_total += amount
+            should_flush = self._pending_total >= self.max_pending
+        self._ensure_thread()
+        if should_flush:
+            self.flush()
+
+    def pending(self, pk):
+        """Increments for ``pk`` not yet written to the database"""
+        with self._lock:
+            return self._pending.get(pk, 0)
+
+    def flush(self):
+        """Write all buffered increments; failed rows go back into the buffer"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+                self._pending_total = 0
+            if not batch:
+                return 0
+
+            model_class = self.model_class
+            try:
+                with transaction.atomic():
+                    for pk, amount in sorted(batch.items()):
+                        model_class.objects.filter(pk=pk).update(
+                            **{self.field: models.F(self.field) + amount}
+                        )
+            except Exception as e:
+                logger.error(f"Error flushing {self.model_label}.{self.field} counters: {str(e)}")
+                with self._lock:
+                    self._pending.update(batch)
+                    self._pending_total += sum(batch.values())
+                return 0
+            return len(batch)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.model_label}-{self.field}-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            connection.close()
+
+
+article_views = BufferedCounter("main.Article", "views")
@@ -0,0 +1,105 @@
+"""Per-process database connection statistics.
+
+``connection_created`` is counted per alias (see signals.py), so comparing
+the number of connections opened with the number of requests served shows
+whether persistent connections or the pool are actually being reused. When
+Django's native pool is configured, its own counters are included.
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+_lock = threading.Lock()
+_opened = Counter()
+_last_opened = {}
+
+
+def record_connection(connection):
+    with _lock:
+        _opened[connection.alias] += 1
+        _last_opened[connection.alias] = time.time()
+
+
+def run_with_connection_checks(call):
+    """Call ``call()`` on a long-lived worker thread.
+
+    Such threads outlive requests, so the request-boundary connection checks
+    (CONN_MAX_AGE, broken connections) are applied around each call instead.
+    """
+    close_old_connections()
+    try:
+        return call()
+    finally:
+        close_old_connections()
+
+
+@contextmanager
+def statement_budget(seconds, using=DEFAULT_DB_ALIAS):
+    """Cancel any query in the block still running after ``seconds`` (PostgreSQL and SQLite)"""
+    connection = connections[using]
+    if connection.in_atomic_block or connection.vendor not in ("postgresql", "sqlite"):
+        # A cancelled statement would abort the surrounding transaction.
+        yield
+        return
+
+    connection.ensure_connection()
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET statement_timeout = {max(1, int(seconds * 1000))}")
+        try:
+            yield
+        finally:
+            # Back to the session default, DB_STATEMENT_TIMEOUT_MS included.
+            with connection.cursor() as cursor:
+                cursor.execute("RESET statement_timeout")
+    else:
+        deadline = time.monotonic() + seconds
+        connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        try:
+            yield
+        finally:
+            connection.connection.set_progress_handler(None, 0)
+
+
+def connections_opened(alias=DEFAULT_DB_ALIAS):
+    with _lock:
+        return _opened[alias]
+
+
+def pool_stats(alias=DEFAULT_DB_ALIAS):
+    """Connection reuse figures for ``alias`` in this process"""
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    with _lock:
+        stats = {
+            "alias": alias,
+            "vendor": connection.vendor,
+            "conn_max_age": settings_dict.get("CONN_MAX_AGE", 0),
+            "health_checks": settings_dict.get("CONN_HEALTH_CHECKS", False),
+            "opened": _opened[alias],
+            "last_opened": _last_opened.get(alias),
+            "connected": connection.connection is not None,
+        }
+    # Only the PostgreSQL backend has ``pool``; it is None unless configured.
+    pool = getattr(connection, "pool", None)
+    if pool is not None:
+        stats["pool"] = pool.get_stats()
+    return stats
+
+
+@contextmanager
+def preserve_timestamps(model_class):
+    """Stop auto_now/auto_now_add overwriting the values set on the objects during bulk_create"""
+    saved = []
+    for field in model_class._meta.concrete_fields:
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            saved.append((field, field.auto_now, field.auto_now_add))
+            field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
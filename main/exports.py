@@ -0,0 +1,94 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+EXPORT_FIELDS = (
+    "id", "full_name", "email", "phone", "company_name",
+    "country", "job_title", "job_details", "created_at",
+)
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line straight back"""
+
+    def write(self, value):
+        return value
+
+
+def filter_inquiries(queryset, params):
+    """Apply the optional ``date_from``/``date_to`` (YYYY-MM-DD) and ``country`` filters"""
+    date_from = parse_date(params.get("date_from", "") or "")
+    date_to = parse_date(params.get("date_to", "") or "")
+    if date_from:
+        queryset = queryset.filter(
+            created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min))
+        )
+    if date_to:
+        queryset = queryset.filter(
+            created_at__lte=timezone.make_aware(datetime.combine(date_to, time.max))
+        )
+    if params.get("country"):
+        queryset = queryset.filter(country__iexact=params["country"])
+    return queryset
+
+
+def _rows(queryset):
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+# Spreadsheets run a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    """``value`` made safe to open in a spreadsheet; inquiry fields are public form input"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    lines = []
+    for row in _rows(queryset):
+        lines.append(writer.writerow([csv_cell(value) for value in row]))
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def iter_ndjson(queryset):
+    lines = []
+    for row in _rows(queryset):
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["created_at"] = record["created_at"].isoformat()
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def export_response(queryset, fmt):
+    """Stream ``queryset`` as CSV or NDJSON without materialising it"""
+    stream = iter_csv(queryset) if fmt == "csv" else iter_ndjson(queryset)
+    response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[fmt])
+    filename = f"inquiries-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -1,5 +1,7 @@
+import uuid
+
 from django import forms
-from .models import Inquiry
+from .models import EventRegistration, Inquiry
 
 
 class ContactForm(forms.ModelForm):
@@ -34,4 +36,26 @@ class ContactForm(forms.ModelForm):
         phone = self.cleaned_data.get("phone", "").strip()
         if not phone:
             raise forms.ValidationError("Phone number is required.")
-        return phone 
\ No newline at end of file
+        return phone 
+
+class EventRegistrationForm(forms.ModelForm):
+    # Generated when the form is rendered and posted back with it, so a
+    # double submit carries the same key (see main.registrations).
+    idempotency_key = forms.CharField(max_length=64, widget=forms.HiddenInput)
+
+    class Meta:
+        model = EventRegistration
+        fields = ["full_name", "email", "idempotency_key"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.is_bound:
+            self.initial.setdefault("idempotency_key", uuid.uuid4().hex)
+        for field_name, field in self.fields.items():
+            if field_name != "idempotency_key":
+                field.widget.attrs["class"] = "form-field"
+                field.widget.attrs["placeholder"] = f"Enter your {field_name.replace('_', ' ').title()}"
+
+    def validate_unique(self):
+        # A known key is a resubmit, answered by main.registrations.register.
+        pass
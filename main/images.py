@@ -0,0 +1,228 @@
+"""Resized WebP/JPEG variants of uploaded images.
+
+Every ``ImageField`` listed in :data:`IMAGE_FIELDS` gets one WebP and one
+JPEG file per width in ``IMAGE_VARIANT_WIDTHS`` narrower than the original.
+Variants are stored next to the media as
+``variants/<dir>/<stem>-<digest>-<width>w.<ext>``, where the digest is a
+hash of the source file's bytes. A file replaced under the same name gets
+new variant URLs, so a variant URL always refers to the same bytes and can
+be cached indefinitely. The digest is computed while the variants are
+generated and recorded with their widths in a manifest,
+``variants/<dir>/<filename>.json``; rendering reads the manifest and never
+hashes the original.
+
+Saves schedule the work with ``transaction.on_commit`` on a process pool, so
+admin requests return as soon as the original is stored. The
+``responsive_image`` template tag emits ``srcset`` once the manifest is
+written and falls back to the original until then, or when the original has
+changed since.
+"""
+import atexit
+import hashlib
+import io
+import json
+import logging
+import os
+import posixpath
+import threading
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .cache import LocalLRUCache, bump_generation
+
+logger = logging.getLogger(__name__)
+
+# model label -> image field names
+IMAGE_FIELDS = {
+    "main.Solution": ("image",),
+    "main.Event": ("image",),
+    "main.Article": ("image",),
+    "main.GalleryImage": ("image",),
+}
+
+VARIANT_DIR = "variants"
+FORMATS = (("webp", "WEBP"), ("jpg", "JPEG"))
+
+# Until an upload's manifest exists, re-check storage at most this often.
+MISSING_RECHECK_SECONDS = 30
+
+_manifests = LocalLRUCache(2048)  # name -> (checked at, manifest or None)
+
+
+def _hash_file(name):
+    digest = hashlib.md5(usedforsecurity=False)
+    with default_storage.open(name, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:10]
+
+
+def _signature(name):
+    """``[size, mtime]`` of the stored file, or None if the storage cannot tell"""
+    try:
+        return [default_storage.size(name), default_storage.get_modified_time(name).timestamp()]
+    except (OSError, NotImplementedError):
+        return None
+
+
+def manifest_name(name):
+    directory, filename = posixpath.split(name)
+    return posixpath.join(VARIANT_DIR, directory, f"{filename}.json")
+
+
+def variant_name(name, width, ext, digest):
+    """Storage name of the ``width``-pixel ``ext`` variant of ``name`` hashing to ``digest``"""
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(VARIANT_DIR, directory, f"{stem}-{digest}-{width}w.{ext}")
+
+
+def variant_manifest(name):
+    """``{"digest", "widths"}`` of the variants of the current ``name``, or None; memoised per process"""
+    now = time.monotonic()
+    entry = _manifests.get(name)
+    if entry is not None and now - entry[0] < MISSING_RECHECK_SECONDS:
+        return entry[1]
+    try:
+        with default_storage.open(manifest_name(name), "rb") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if manifest is not None and manifest["signature"] not in (None, _signature(name)):
+        # Replaced since the variants were made: serve the original until they are redone.
+        manifest = None
+    _manifests.set(name, (now, manifest))
+    return manifest
+
+
+def generate_variants(name, force=False):
+    """Write the missing variants of ``name`` and its manifest; returns how many variants were written.
+
+    Runs inside pool workers, so it only touches storage, never the database.
+    """
+    from PIL import Image, ImageOps
+
+    written = 0
+    widths = []
+    signature = _signature(name)
+    digest = _hash_file(name)
+    with default_storage.open(name, "rb") as source:
+        with Image.open(source) as original:
+            original = ImageOps.exif_transpose(original)
+            for width in settings.IMAGE_VARIANT_WIDTHS:
+                if width >= original.width:
+                    break
+                widths.append(width)
+                height = max(1, round(original.height * width / original.width))
+                resized = None
+                for ext, pil_format in FORMATS:
+                    target = variant_name(name, width, ext, digest)
+                    if not force and default_storage.exists(target):
+                        continue
+                    if resized is None:
+                        resized = original.resize((width, height), Image.Resampling.LANCZOS)
+                    image = resized
+                    if pil_format == "JPEG" and image.mode != "RGB":
+                        image = image.convert("RGB")
+                    elif pil_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+                        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+                    buffer = io.BytesIO()
+                    image.save(
+                        buffer, pil_format, quality=settings.IMAGE_VARIANT_QUALITY, optimize=True
+                    )
+                    _replace(target, buffer.getvalue())
+                    written += 1
+    # Written last, so a manifest implies its variants exist.
+    manifest = {"digest": digest, "signature": signature, "widths": widths}
+    _replace(manifest_name(name), json.dumps(manifest).encode())
+    return written
+
+
+def _replace(name, content):
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, ContentFile(content))
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+class VariantPool:
+    """Lazily started, fork-aware process pool for variant generation"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, name, force=False):
+        # Imported here so web processes that never see an upload skip them.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers or settings.IMAGE_VARIANT_WORKERS,
+                    # spawn, not fork: the web process has live threads and DB connections.
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                self._pid = os.getpid()
+                atexit.register(self._executor.shutdown)
+            try:
+                future = self._executor.submit(generate_variants, name, force)
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool on the next submit.
+                self._executor = None
+                raise
+        future.add_done_callback(lambda done: _log_failure(name, done))
+        return future
+
+
+def _log_failure(name, future):
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Error generating image variants for {name}: {str(error)}")
+
+
+variant_pool = VariantPool()
+
+
+def schedule_variants(name, model_class=None):
+    """Generate variants for ``name`` once the current transaction commits.
+
+    When they are written, ``model_class``'s cached pages are retired so the
+    next render picks up the ``srcset``.
+    """
+    transaction.on_commit(lambda: _generate(name, model_class))
+
+
+def _generate(name, model_class):
+    try:
+        if settings.IMAGE_VARIANT_ASYNC:
+            future = variant_pool.submit(name)
+            future.add_done_callback(lambda done: _variants_ready(name, model_class, done))
+        else:
+            generate_variants(name)
+            _variants_ready(name, model_class)
+    except Exception as e:
+        logger.error(f"Error generating image variants for {name}: {str(e)}")
+
+
+def _variants_ready(name, model_class, future=None):
+    if future is not None and future.exception() is not None:
+        return
+    # Read the new manifest on the next render.
+    _manifests.pop(name)
+    if model_class is not None:
+        bump_generation(model_class)
@@ -0,0 +1,242 @@
+"""Queued, journalled and batched ingestion of contact-form inquiries."""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class InquiryIngestor:
+    def __init__(self, spill_dir=None, max_queue=None, batch_size=None, flush_interval=None):
+        self.spill_dir = Path(spill_dir or settings.INQUIRY_SPILL_DIR)
+        self.max_queue = max_queue or settings.INQUIRY_QUEUE_SIZE
+        self.batch_size = batch_size or settings.INQUIRY_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.INQUIRY_FLUSH_INTERVAL
+        self.max_attempts = settings.INQUIRY_MAX_ATTEMPTS
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._attempts = {}  # seq -> rejected writes so far
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._journal = None
+
+    @property
+    def journal_path(self):
+        return self.spill_dir / f"inquiries-{os.getpid()}.jsonl"
+
+    @property
+    def failed_path(self):
+        return self.spill_dir / "failed-inquiries.jsonl"
+
+    def submit(self, payload):
+        """Queue one validated payload; False when it cannot be queued (full, or no journal)"""
+        try:
+            self._start()
+        except OSError as e:
+            logger.error(f"Inquiry journal unavailable in {self.spill_dir}: {str(e)}")
+            return False
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                return False
+            self._seq += 1
+            seq = self._seq
+            try:
+                self._journal.write(json.dumps({"seq": seq, "data": payload}) + "\n")
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            except OSError as e:
+                logger.error(f"Error journaling an inquiry: {str(e)}")
+                return False
+            self._pending[seq] = payload
+        self._queue.put(seq)
+        return True
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self):
+        """Write everything still pending (called at shutdown)"""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            seqs = sorted(self._pending)
+        for start in range(0, len(seqs), self.batch_size):
+            self._write(seqs[start:start + self.batch_size])
+
+    def _start(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # First use in this process (or after a fork): fresh state and journal.
+                self._queue = queue.Queue()
+                self._pending = {}
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+                self._pid = os.getpid()
+                self._recover()
+                atexit.register(self.drain)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="inquiry-ingest", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            seqs = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(seqs) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    seqs.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if not self._write(seqs):
+                time.sleep(self.flush_interval)
+                for seq in seqs:
+                    self._queue.put(seq)
+            if self._queue.empty():
+                connection.close()
+
+    def _insert(self, batch):
+        from .models import Inquiry
+        from .stats import record_inquiries
+
+        with transaction.atomic():
+            # bulk_create sends no signals, so count the rollups here.
+            record_inquiries(Inquiry.objects.bulk_create([Inquiry(**data) for _, data in batch]))
+
+    def _write(self, seqs):
+        """Insert the payloads for ``seqs`` and trim the journal; False if any must be retried"""
+        from .cache import bump_generation
+        from .models import Inquiry
+
+        with self._write_lock:
+            with self._lock:
+                batch = [(seq, self._pending[seq]) for seq in seqs if seq in self._pending]
+            if not batch:
+                return True
+            try:
+                self._insert(batch)
+                written, rejected = batch, []
+            except (OperationalError, InterfaceError) as e:
+                # Database unreachable: every row is retried, none is to blame.
+                logger.error(f"Error writing {len(batch)} queued inquiries: {str(e)}")
+                return False
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} queued inquiries: {str(e)}")
+                written, rejected = self._write_rows(batch) if len(batch) > 1 else ([], [(*batch[0], e)])
+            if written:
+                bump_generation(Inquiry)
+
+            with self._lock:
+                quarantined = []
+                for seq, data, error in rejected:
+                    self._attempts[seq] = self._attempts.get(seq, 0) + 1
+                    if self._attempts[seq] >= self.max_attempts:
+                        quarantined.append((seq, data, error))
+                for seq in [item[0] for item in written] + [item[0] for item in quarantined]:
+                    self._pending.pop(seq, None)
+                    self._attempts.pop(seq, None)
+                if quarantined:
+                    self._quarantine(quarantined)
+                self._rewrite_journal()
+            return len(written) + len(quarantined) == len(batch)
+
+    def _write_rows(self, batch):
+        """Insert ``batch`` one row at a time: ``(written, [(seq, data, error)])``"""
+        written, rejected = [], []
+        for item in batch:
+            try:
+                self._insert([item])
+                written.append(item)
+            except Exception as e:
+                rejected.append((*item, e))
+        return written, rejected
+
+    def _quarantine(self, rows):
+        """Append rows given up on to the failed-inquiries file (lock held)"""
+        with open(self.failed_path, "a", encoding="utf-8") as failed:
+            for _, data, error in rows:
+                failed.write(json.dumps({"data": data, "error": str(error)}) + "\n")
+            failed.flush()
+            os.fsync(failed.fileno())
+        logger.error(f"Moved {len(rows)} inquiries that kept failing to {self.failed_path}")
+
+    def _rewrite_journal(self):
+        """Atomically replace the journal with the still-pending payloads (lock held)"""
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            for seq, data in sorted(self._pending.items()):
+                tmp.write(json.dumps({"seq": seq, "data": data}) + "\n")
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, self.journal_path)
+        self._journal.close()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _recover(self):
+        """Re-queue journals left by processes that died before draining (lock held)"""
+        for path in self.spill_dir.glob("inquiries-*.jsonl"):
+            try:
+                pid = int(path.stem.split("-", 1)[1])
+            except ValueError:
+                continue
+            if pid == os.getpid() or _pid_alive(pid):
+                continue
+            claimed = path.with_name(f"{path.name}.{os.getpid()}.recovering")
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue  # another process claimed it first
+            recovered = 0
+            with open(claimed, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        data = json.loads(line)["data"]
+                    except (ValueError, KeyError):
+                        continue  # torn last line from the crash
+                    self._seq += 1
+                    self._journal.write(json.dumps({"seq": self._seq, "data": data}) + "\n")
+                    self._pending[self._seq] = data
+                    self._queue.put(self._seq)
+                    recovered += 1
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            claimed.unlink()
+            logger.info(f"Recovered {recovered} queued inquiries from {path.name}")
+
+
+inquiry_ingestor = InquiryIngestor()
+
+
+def save_inquiry(form):
+    """Persist a valid ContactForm inline or through the ingestion queue"""
+    if settings.INQUIRY_INGEST_MODE == "queued":
+        if inquiry_ingestor.submit(form.cleaned_data):
+            return
+        logger.warning("Inquiry queue full; saving synchronously")
+    form.save()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from main.cache import bump_generation
+from main.models import Inquiry
+from main.stats import rebuild_inquiry_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-day InquiryRollup rows (overall, country, job title) from the Inquiry table"
+
+    def handle(self, *args, **options):
+        total = rebuild_inquiry_rollups()
+        bump_generation(Inquiry)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} inquiry rollup rows."))
@@ -0,0 +1,143 @@
+import asyncio
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from .bench_routes import _http, percentile
+
+# The routes config.urls_async serves with async views (the dashboard needs a login).
+ASYNC_ROUTES = ["solutions", "testimonials", "articles", "events"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync views under WSGI with their async versions under ASGI at high "
+        "concurrency: latency percentiles and throughput per route"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Measured requests per route and mode")
+        parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight at once")
+        parser.add_argument("--route", action="append", dest="routes", choices=ASYNC_ROUTES)
+        parser.add_argument(
+            "--no-cache", action="store_true",
+            help="Use the dummy cache backend, so every request renders the page",
+        )
+        parser.add_argument(
+            "--no-snapshot", action="store_true",
+            help="Read the listings from the database instead of the content snapshot",
+        )
+        parser.add_argument(
+            "--wsgi-url", default="",
+            help="Base URL of a running WSGI server (e.g. gunicorn config.wsgi); needs --asgi-url",
+        )
+        parser.add_argument(
+            "--asgi-url", default="",
+            help="Base URL of a running ASGI server (e.g. uvicorn config.asgi:application)",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        if bool(options["wsgi_url"]) != bool(options["asgi_url"]):
+            raise CommandError("--wsgi-url and --asgi-url go together.")
+
+        # The test clients send Host: testserver.
+        overrides = {"ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"]}
+        if options["no_cache"]:
+            overrides["CACHES"] = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        if options["no_snapshot"]:
+            overrides["CONTENT_SNAPSHOT"] = False
+
+        self.stdout.write(
+            f"{'route':<14}{'mode':<6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'errors':>8}"
+        )
+        with override_settings(**overrides):
+            for name in options["routes"] or ASYNC_ROUTES:
+                path = reverse(name)
+                if options["wsgi_url"]:
+                    self.report(name, "wsgi", self.bench_http(options["wsgi_url"], path))
+                    self.report(name, "asgi", self.bench_http(options["asgi_url"], path))
+                    continue
+                self.report(name, "wsgi", self.bench_wsgi(path))
+                with override_settings(ROOT_URLCONF="config.urls_async"):
+                    self.report(name, "asgi", asyncio.run(self.bench_asgi(path)))
+
+    def bench_wsgi(self, path):
+        per_thread = max(1, self.options["requests"] // self.options["concurrency"])
+
+        def worker():
+            client = Client()
+            samples = []
+            try:
+                client.get(path)
+                for _ in range(per_thread):
+                    started = time.perf_counter()
+                    status = client.get(path).status_code
+                    samples.append(((time.perf_counter() - started) * 1000, status))
+            finally:
+                connections.close_all()
+            return samples
+
+        return self.run_threads(worker)
+
+    async def bench_asgi(self, path):
+        per_task = max(1, self.options["requests"] // self.options["concurrency"])
+
+        async def worker():
+            client = AsyncClient()
+            samples = []
+            await client.get(path)
+            for _ in range(per_task):
+                started = time.perf_counter()
+                status = (await client.get(path)).status_code
+                samples.append(((time.perf_counter() - started) * 1000, status))
+            return samples
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(worker() for _ in range(self.options["concurrency"])))
+        return [sample for samples in results for sample in samples], time.perf_counter() - started
+
+    def bench_http(self, base_url, path):
+        url = base_url.rstrip("/") + path
+        per_thread = max(1, self.options["requests"] // self.options["concurrency"])
+
+        def fetch():
+            try:
+                with _http.open(url) as response:
+                    response.read()
+                    return response.status
+            except urllib.error.HTTPError as e:
+                return e.code
+
+        def worker():
+            fetch()
+            samples = []
+            for _ in range(per_thread):
+                started = time.perf_counter()
+                status = fetch()
+                samples.append(((time.perf_counter() - started) * 1000, status))
+            return samples
+
+        return self.run_threads(worker)
+
+    def run_threads(self, worker):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.options["concurrency"]) as executor:
+            futures = [executor.submit(worker) for _ in range(self.options["concurrency"])]
+            samples = [sample for future in futures for sample in future.result()]
+        return samples, time.perf_counter() - started
+
+    def report(self, name, mode, result):
+        samples, elapsed = result
+        latencies = [latency for latency, _ in samples]
+        errors = sum(1 for _, status in samples if status >= 400)
+        self.stdout.write(
+            f"{name:<14}{mode:<6}{percentile(latencies, 0.50):>9.2f}{percentile(latencies, 0.95):>9.2f}"
+            f"{percentile(latencies, 0.99):>9.2f}{len(samples) / elapsed:>10.1f}{errors:>8}"
+        )
@@ -0,0 +1,218 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.urls import URLPattern, reverse
+
+from main import urls as main_urls
+from main.middleware import collect_timings
+from main.models import Article
+
+# Query strings for routes that do nothing interesting without one.
+ROUTE_QUERIES = {
+    "search": "?q=ai",
+}
+
+
+def _sample_kwargs(name):
+    """URL kwargs for parameterised routes; None when there is nothing to request"""
+    if name == "article_detail":
+        slug = Article.objects.filter(is_published=True).values_list("slug", flat=True).first()
+        return {"slug": slug} if slug else None
+    return None
+
+
+def discover_routes(names=None):
+    """``{name: path}`` for every named GET route in main/urls.py"""
+    routes = {}
+    for pattern in main_urls.urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        if names and pattern.name not in names:
+            continue
+        kwargs = {}
+        if pattern.pattern.converters:
+            kwargs = _sample_kwargs(pattern.name)
+            if kwargs is None:
+                continue
+        routes[pattern.name] = reverse(pattern.name, kwargs=kwargs) + ROUTE_QUERIES.get(pattern.name, "")
+    return routes
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report redirects (e.g. to a login page) as-is instead of following them"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+_http = urllib.request.build_opener(_NoRedirect)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test every public route in main/urls.py and report latency percentiles, "
+        "throughput and queries per request, optionally against a stored baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per route")
+        parser.add_argument("--concurrency", type=int, default=4, help="Concurrent client threads")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per route first")
+        parser.add_argument("--route", action="append", dest="routes", help="Only this URL name; repeatable")
+        parser.add_argument(
+            "--no-cache", action="store_true",
+            help="Use the dummy cache backend, so every request renders the page",
+        )
+        parser.add_argument(
+            "--server", default="",
+            help="Base URL of a running server (e.g. http://127.0.0.1:8000) instead of the test client; "
+                 "queries per request are not measured then",
+        )
+        parser.add_argument("--baseline", help="Baseline JSON to compare against; regressions fail")
+        parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed p95 slowdown against the baseline, as a fraction (default 0.25)",
+        )
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=2.0,
+            help="Ignore p95 slowdowns smaller than this many milliseconds (timer noise)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        self.options = options
+        routes = discover_routes(options["routes"])
+        if not routes:
+            raise CommandError("No routes to benchmark.")
+
+        if options["no_cache"]:
+            with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}):
+                results = self.bench_all(routes)
+        else:
+            results = self.bench_all(routes)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.print_table(results)
+
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(json.dumps(results, indent=2) + "\n")
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+        if options["baseline"]:
+            self.compare(results, json.loads(Path(options["baseline"]).read_text()))
+
+    def bench_all(self, routes):
+        results = {}
+        for name, path in routes.items():
+            status = self.fetch(Client(HTTP_HOST="localhost"), path)[0]
+            if status in (301, 302):
+                self.stderr.write(f"Skipping {path}: redirects (login required?)")
+                continue
+            if status != 200:
+                raise CommandError(f"{path} returned {status}")
+            results[name] = {"path": path, **self.bench(path)}
+        return results
+
+    def bench(self, path):
+        concurrency = self.options["concurrency"]
+        per_thread = max(1, self.options["requests"] // concurrency)
+
+        def worker():
+            client = Client(HTTP_HOST="localhost")
+            samples = []
+            try:
+                for _ in range(self.options["warmup"] // concurrency):
+                    self.fetch(client, path)
+                for _ in range(per_thread):
+                    started = time.perf_counter()
+                    status, queries = self.fetch(client, path)
+                    samples.append(((time.perf_counter() - started) * 1000, queries, status))
+            finally:
+                connections.close_all()
+            return samples
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+            samples = [sample for future in futures for sample in future.result()]
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for latency, _, _ in samples]
+        queries = [count for _, count, _ in samples if count is not None]
+        return {
+            "requests": len(samples),
+            "errors": sum(1 for _, _, status in samples if status >= 400),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            "queries_per_request": round(statistics.mean(queries), 2) if queries else None,
+        }
+
+    def fetch(self, client, path):
+        """GET ``path``; returns ``(status, queries)`` (queries is None over HTTP)"""
+        if self.options["server"]:
+            try:
+                with _http.open(self.options["server"].rstrip("/") + path) as response:
+                    response.read()
+                    return response.status, None
+            except urllib.error.HTTPError as e:
+                return e.code, None
+        # Counts the queries of worker threads too (async views).
+        with collect_timings() as timings:
+            response = client.get(path)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        return response.status_code, timings.query_count
+
+    def print_table(self, results):
+        self.stdout.write(
+            f"{'route':<18}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'queries':>9}{'errors':>8}"
+        )
+        for name, result in results.items():
+            queries = result["queries_per_request"]
+            self.stdout.write(
+                f"{name:<18}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['throughput_rps']:>10.1f}{'-' if queries is None else queries:>9}{result['errors']:>8}"
+            )
+
+    def compare(self, results, baseline):
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            limit = max(before["p95_ms"] * (1 + self.options["tolerance"]), before["p95_ms"] + self.options["min_delta_ms"])
+            if result["p95_ms"] > limit:
+                regressions.append(f"{name}: p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+            if (
+                result["queries_per_request"] is not None
+                and before.get("queries_per_request") is not None
+                and result["queries_per_request"] > before["queries_per_request"]
+            ):
+                regressions.append(
+                    f"{name}: queries/request {before['queries_per_request']} -> {result['queries_per_request']}"
+                )
+            if result["errors"] > before.get("errors", 0):
+                regressions.append(f"{name}: errors {before.get('errors', 0)} -> {result['errors']}")
+
+        if regressions:
+            for line in regressions:
+                self.stderr.write(line)
+            raise CommandError(f"{len(regressions)} regressions against {self.options['baseline']}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {self.options['baseline']}."))
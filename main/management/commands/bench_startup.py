@@ -0,0 +1,71 @@
+import json
+import os
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.profiling import run_entry_point
+
+# entry module -> settings module
+DEFAULT_ENTRIES = {
+    "config.wsgi": "config.settings",
+    "config.wsgi_public": "config.settings_public",
+}
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time to first response of the WSGI entry points in fresh interpreters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entry", action="append", dest="entries",
+            help="entry[=settings.module]; repeatable (default: config.wsgi and config.wsgi_public)",
+        )
+        parser.add_argument("--path", default="/test/", help="Path of the first request")
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    def handle(self, *args, **options):
+        entries = DEFAULT_ENTRIES
+        if options["entries"]:
+            entries = {}
+            for spec in options["entries"]:
+                entry, _, settings_module = spec.partition("=")
+                entries[entry] = settings_module or os.environ["DJANGO_SETTINGS_MODULE"]
+
+        # Interleave the entries so drift on a busy machine hits them equally.
+        samples = {entry: [] for entry in entries}
+        for _ in range(options["runs"]):
+            for entry, settings_module in entries.items():
+                try:
+                    stats, _ = run_entry_point(entry, settings_module, options["path"])
+                except RuntimeError as e:
+                    raise CommandError(str(e))
+                if not (stats["status"] or "").startswith("200"):
+                    raise CommandError(f"{entry} answered {options['path']} with {stats['status']}")
+                samples[entry].append(stats)
+
+        results = {
+            entry: {
+                "settings": entries[entry],
+                "modules": runs[-1]["modules"],
+                **{
+                    f"{key}_{name}": round(func([run[key] for run in runs]), 1)
+                    for key in ("import_ms", "first_response_ms")
+                    for name, func in (("min", min), ("median", statistics.median), ("max", max))
+                },
+            }
+            for entry, runs in samples.items()
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"Time to first response for GET {options['path']} ({options['runs']} runs each):")
+        for entry, result in results.items():
+            self.stdout.write(
+                f"  {entry:<22} median {result['first_response_ms_median']:7.1f} ms "
+                f"(min {result['first_response_ms_min']:.1f}, max {result['first_response_ms_max']:.1f}; "
+                f"import {result['import_ms_median']:.1f} ms, {result['modules']} modules)"
+            )
@@ -0,0 +1,99 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from main.db import connections_opened, pool_stats
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate request cycles against the database and report how often connections are "
+        "reused, and what a request costs with and without reuse"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Simulated requests per mode")
+        parser.add_argument("--threads", type=int, default=4, help="Concurrent worker threads")
+        parser.add_argument("--idle", type=float, default=0.0, help="Seconds each worker idles between requests")
+        parser.add_argument(
+            "--compare", action="store_true",
+            help="Also run with CONN_MAX_AGE=0 (a fresh connection per request)",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.alias = options["database"]
+        settings_dict = connections[self.alias].settings_dict
+
+        self.report("configured", self.run(options))
+        if options["compare"]:
+            if "pool" in settings_dict.get("OPTIONS", {}):
+                self.stdout.write("Skipping --compare: a connection pool is configured.")
+            else:
+                saved = settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"]
+                # Every thread's wrapper shares this dict, so the override reaches them all.
+                settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"] = 0, False
+                try:
+                    self.report("no reuse", self.run(options))
+                finally:
+                    settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"] = saved
+
+        stats = pool_stats(self.alias)
+        self.stdout.write(
+            f"\n{stats['vendor']} CONN_MAX_AGE={stats['conn_max_age']} "
+            f"CONN_HEALTH_CHECKS={stats['health_checks']}"
+        )
+        if "pool" in stats:
+            self.stdout.write(f"pool: {stats['pool']}")
+
+    def run(self, options):
+        per_thread = max(1, options["requests"] // options["threads"])
+        opened_before = connections_opened(self.alias)
+
+        def worker():
+            latencies = []
+            try:
+                for _ in range(per_thread):
+                    latencies.append(self.simulate_request())
+                    if options["idle"]:
+                        time.sleep(options["idle"])
+            finally:
+                connections.close_all()
+            return latencies
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["threads"]) as executor:
+            futures = [executor.submit(worker) for _ in range(options["threads"])]
+            latencies = [latency for future in futures for latency in future.result()]
+        elapsed = time.perf_counter() - started
+        return latencies, connections_opened(self.alias) - opened_before, elapsed
+
+    def simulate_request(self):
+        """One request cycle: the same connection hand-offs Django's handler performs"""
+        request_started.send(sender=self.__class__)
+        try:
+            started = time.perf_counter()
+            with connections[self.alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            return (time.perf_counter() - started) * 1000
+        finally:
+            request_finished.send(sender=self.__class__)
+
+    def report(self, mode, result):
+        latencies, opened, elapsed = result
+        reuse = 1 - opened / len(latencies)
+        self.stdout.write(
+            f"{mode:>10}: {len(latencies)} requests, {opened} connections opened "
+            f"({reuse:.0%} reuse), p50 {statistics.median(latencies):.2f} ms, "
+            f"p95 {_percentile(latencies, 0.95):.2f} ms, {len(latencies) / elapsed:,.0f} req/s"
+        )
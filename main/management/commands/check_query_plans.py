@@ -0,0 +1,158 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from main.pagination import keyset_paginate
+from main.models import Article, Event, GalleryImage, Inquiry, PricingPlan, Solution, Testimonial
+
+LISTING_URLS = {
+    "/solutions/": Solution.objects.filter(is_active=True),
+    "/testimonials/": Testimonial.objects.filter(is_active=True),
+    "/articles/": Article.objects.filter(is_published=True),
+    "/gallery/": GalleryImage.objects.all(),
+    "/events/": Event.objects.filter(is_active=True),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed_rows(rows):
+    """Bulk-insert ``rows`` of every listing model so the planner sees a realistic table size"""
+    rng = random.Random(0)
+    now = timezone.now()
+
+    def when(i):
+        return now - timedelta(minutes=i)
+
+    Solution.objects.bulk_create([
+        Solution(
+            title=f"Solution {i}", description="Seeded", category=rng.choice(Solution.CATEGORY_CHOICES)[0],
+            is_featured=rng.random() < 0.05, is_active=rng.random() < 0.9,
+        )
+        for i in range(rows)
+    ], batch_size=1000)
+    Event.objects.bulk_create([
+        Event(
+            title=f"Event {i}", description="Seeded", event_type=rng.choice(Event.EVENT_TYPE_CHOICES)[0],
+            date=when(-i), location="London", duration="2 hours",
+            is_featured=rng.random() < 0.05, is_active=rng.random() < 0.9,
+        )
+        for i in range(rows)
+    ], batch_size=1000)
+    Article.objects.bulk_create([
+        Article(
+            title=f"Article {i}", slug=f"seeded-article-{i}", description="Seeded",
+            category=rng.choice(Article.CATEGORY_CHOICES)[0], read_time=5, published_at=when(i),
+            is_featured=rng.random() < 0.05, is_published=rng.random() < 0.9,
+        )
+        for i in range(rows)
+    ], batch_size=1000)
+    Testimonial.objects.bulk_create([
+        Testimonial(
+            name=f"Client {i}", position="CTO", company="Seeded Ltd",
+            industry=rng.choice(Testimonial.INDUSTRY_CHOICES)[0], content="Seeded",
+            rating=rng.randint(1, 5), avatar_initials="SL",
+            is_featured=rng.random() < 0.05, is_active=rng.random() < 0.9,
+        )
+        for i in range(rows)
+    ], batch_size=1000)
+    GalleryImage.objects.bulk_create([
+        GalleryImage(title=f"Image {i}", category=rng.choice(GalleryImage.CATEGORY_CHOICES)[0], alt_text="Seeded")
+        for i in range(rows)
+    ], batch_size=1000)
+    PricingPlan.objects.bulk_create([
+        PricingPlan(name=f"Plan {i}", price=f"£{i}", is_active=rng.random() < 0.9)
+        for i in range(rows // 100)
+    ], batch_size=1000)
+    Inquiry.objects.bulk_create([
+        Inquiry(full_name=f"Lead {i}", email=f"lead{i}@example.com", phone="0", job_details="Seeded")
+        for i in range(rows)
+    ], batch_size=1000)
+
+
+def full_scans(sql, params):
+    """Return the plan lines that read a ``main_`` table without any index"""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            lines = [row[-1] for row in cursor.fetchall()]
+            return [
+                line for line in lines
+                if line.startswith("SCAN main_") and "INDEX" not in line
+            ]
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN {sql}", params)
+            lines = [row[0] for row in cursor.fetchall()]
+            return [line.strip() for line in lines if "Seq Scan on main_" in line]
+    raise CommandError(f"EXPLAIN checks are not implemented for {connection.vendor}")
+
+
+class Command(BaseCommand):
+    help = "Fail if any listing view's queries fall back to a full table scan on a large dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed", type=int, default=20000,
+            help="Rows to insert per model before checking (rolled back afterwards; 0 uses existing data)",
+        )
+
+    def handle(self, *args, **options):
+        problems = []
+        try:
+            with transaction.atomic():
+                if options["seed"]:
+                    seed_rows(options["seed"])
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE")
+                problems = self.check_urls()
+                raise Rollback
+        except Rollback:
+            pass
+
+        if problems:
+            for url, sql, lines in problems:
+                self.stderr.write(f"{url}: {sql}")
+                for line in lines:
+                    self.stderr.write(f"    {line}")
+            raise CommandError(f"{len(problems)} listing queries use a full table scan.")
+        self.stdout.write(self.style.SUCCESS("All listing queries use an index."))
+
+    # Render from the database, on this thread, so the listing queries are captured.
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        CONTENT_SNAPSHOT=False,
+        READ_BUDGET_SECONDS=0,
+    )
+    def check_urls(self):
+        client = Client(HTTP_HOST="localhost")
+        problems = []
+        for url, queryset in LISTING_URLS.items():
+            # Check the second page too: the keyset predicate must stay indexed.
+            urls = [url]
+            next_cursor = keyset_paginate(queryset).next_cursor
+            if next_cursor:
+                urls.append(f"{url}?after={next_cursor}")
+
+            checked = 0
+            for page_url in urls:
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(page_url)
+                if response.status_code != 200:
+                    raise CommandError(f"{page_url} returned {response.status_code}")
+                for query in ctx.captured_queries:
+                    sql = query["sql"]
+                    if not sql.startswith("SELECT"):
+                        continue
+                    checked += 1
+                    lines = full_scans(sql, ())
+                    if lines:
+                        problems.append((page_url, sql, lines))
+            self.stdout.write(f"{url}: {checked} queries checked")
+        return problems
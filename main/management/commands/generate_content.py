@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, time as dt_time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from main import search
+from main.cache import bump_generation
+from main.models import EventRegistration
+from main.snapshot import bump_content_version
+from main.stats import rebuild_content_stats, rebuild_inquiry_rollups
+from main.synthetic import GENERATORS, generate_batch, init_worker, rows_for
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill every main model with reproducible synthetic rows for scale testing "
+        "(--scale rows per model; pricing plans are scaled down)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1000, help="Rows per model (1k to 10M)")
+        parser.add_argument("--seed", type=int, default=0, help="Same seed, same rows")
+        parser.add_argument(
+            "--anchor", default="2026-01-01",
+            help="YYYY-MM-DD that generated dates are spread around (default: %(default)s, so runs repeat)",
+        )
+        parser.add_argument("--model", action="append", dest="models", help="Only this label, e.g. main.Article")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per worker task")
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Worker processes (default: CPU count on PostgreSQL, 1 on SQLite)",
+        )
+        parser.add_argument("--start", type=int, default=0, help="First row index (keeps slugs unique across runs)")
+        parser.add_argument("--clear", action="store_true", help="Delete existing rows of the chosen models first")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--skip-rebuild", action="store_true",
+            help="Do not rebuild the content stats, inquiry rollups and search index afterwards",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        labels = options["models"] or list(GENERATORS)
+        unknown = sorted(set(labels) - set(GENERATORS))
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(unknown)}; choose from {', '.join(GENERATORS)}")
+
+        try:
+            anchor_date = parse_date(options["anchor"])
+        except ValueError:
+            anchor_date = None
+        if anchor_date is None:
+            raise CommandError("--anchor must be YYYY-MM-DD")
+        anchor = timezone.make_aware(datetime.combine(anchor_date, dt_time(12)))
+
+        workers = options["workers"]
+        if workers is None:
+            # SQLite has a single writer; extra processes would only queue on its lock.
+            workers = 1 if connections[using].vendor == "sqlite" else os.cpu_count() or 1
+
+        if options["clear"]:
+            model_classes = [apps.get_model(label) for label in labels]
+            if "main.Event" in labels:
+                # Registrations point at the events and would block their removal.
+                model_classes.insert(0, EventRegistration)
+            # The statements flush uses (DELETE, or TRUNCATE on PostgreSQL): QuerySet.delete()
+            # would load every row to send its delete signals.
+            connection = connections[using]
+            connection.ops.execute_sql_flush(
+                connection.ops.sql_flush(no_style(), [model._meta.db_table for model in model_classes])
+            )
+            for model_class in model_classes:
+                self.stdout.write(f"Cleared {model_class._meta.label}")
+
+        tasks = []
+        for label in labels:
+            total = rows_for(label, options["scale"])
+            for offset in range(0, total, options["batch_size"]):
+                start = options["start"] + offset
+                tasks.append((label, start, min(options["batch_size"], total - offset)))
+
+        started = time.monotonic()
+        try:
+            loaded = self.run_tasks(tasks, workers, options["seed"], anchor, using)
+        except IntegrityError as e:
+            raise CommandError(f"{e}; rows from an earlier run clash, use --clear or a different --start")
+        elapsed = time.monotonic() - started
+
+        if not options["skip_rebuild"]:
+            rebuild_content_stats(using)
+            rebuild_inquiry_rollups(using)
+            if search.is_available():
+                search.rebuild_index(using=using)
+        for label in labels:
+            bump_generation(apps.get_model(label))
+        bump_content_version()
+
+        total = sum(loaded.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Inserted {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s) "
+            f"with {workers} worker(s)"
+        ))
+        for label, count in loaded.items():
+            self.stdout.write(f"  {label}: {count}")
+
+    def run_tasks(self, tasks, workers, seed, anchor, using):
+        loaded = dict.fromkeys(dict.fromkeys(label for label, _, _ in tasks), 0)
+        if workers == 1:
+            for label, start, count in tasks:
+                with transaction.atomic(using=using):
+                    loaded[label] += generate_batch(label, start, count, seed, anchor, using)
+                self.progress(loaded)
+            return loaded
+
+        # Workers open their own connections; ours must not be shared across the spawn.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        ) as executor:
+            futures = {
+                executor.submit(generate_batch, label, start, count, seed, anchor, using): label
+                for label, start, count in tasks
+            }
+            for future in as_completed(futures):
+                loaded[futures[future]] += future.result()
+                self.progress(loaded)
+        return loaded
+
+    def progress(self, loaded):
+        now = time.monotonic()
+        if now - getattr(self, "_last_progress", 0) >= 5:
+            self._last_progress = now
+            self.stdout.write(f"{sum(loaded.values())} rows inserted...")
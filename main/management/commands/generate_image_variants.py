@@ -0,0 +1,56 @@
+from concurrent.futures import as_completed
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from main.cache import bump_generation
+from main.images import IMAGE_FIELDS, VariantPool, generate_variants
+
+
+class Command(BaseCommand):
+    help = "Generate the responsive WebP/JPEG variants for every stored upload"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate variants that already exist")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default IMAGE_VARIANT_WORKERS)")
+        parser.add_argument("--inline", action="store_true", help="Generate in this process, without a pool")
+
+    def handle(self, *args, **options):
+        names = set()
+        for label, fields in IMAGE_FIELDS.items():
+            model_class = apps.get_model(label)
+            for field in fields:
+                names.update(
+                    model_class.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+                    .values_list(field, flat=True).distinct()
+                )
+
+        missing = sorted(name for name in names if not default_storage.exists(name))
+        names = sorted(names - set(missing))
+        for name in missing:
+            self.stderr.write(f"Missing source file: {name}")
+
+        written = failed = 0
+        if options["inline"]:
+            for name in names:
+                try:
+                    written += generate_variants(name, options["force"])
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{name}: {e}")
+        else:
+            pool = VariantPool(options["workers"])
+            futures = {pool.submit(name, options["force"]): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    written += future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{futures[future]}: {e}")
+
+        for label in IMAGE_FIELDS:
+            bump_generation(apps.get_model(label))
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {len(names)} images: {written} variant files written, {failed} failed."
+        ))
@@ -0,0 +1,70 @@
+import gzip
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+try:
+    import brotli
+except ImportError:  # optional: WhiteNoise serves the .gz files without it
+    brotli = None
+
+
+def _write(path, content):
+    """Replace ``path`` atomically so a running server never serves a torn file"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the PRERENDERED_PAGES to static HTML (plus .gz/.br) under PRERENDER_ROOT; "
+        "run after collectstatic so asset URLs match the manifest"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.PRERENDER_ROOT, help="Target directory")
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Do not write anything; fail if any prerendered page is missing or stale",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        stale = []
+
+        # Leave WhiteNoise out so earlier prerendered files are not read back.
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            MIDDLEWARE=[name for name in settings.MIDDLEWARE if not name.startswith("whitenoise.")],
+        ):
+            client = Client()
+            for name in settings.PRERENDERED_PAGES:
+                path = reverse(name)
+                response = client.get(path)
+                if response.status_code != 200 or response.streaming:
+                    raise CommandError(f"{path} returned {response.status_code}; not prerendering it")
+                if response.cookies:
+                    raise CommandError(f"{path} sets cookies, so it cannot be served as a static file")
+
+                target = output / path.strip("/") / "index.html"
+                if options["check"]:
+                    if not target.exists() or target.read_bytes() != response.content:
+                        stale.append(path)
+                    continue
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _write(target, response.content)
+                _write(target.with_name("index.html.gz"), gzip.compress(response.content, 9, mtime=0))
+                if brotli is not None:
+                    _write(target.with_name("index.html.br"), brotli.compress(response.content))
+                self.stdout.write(f"{path} -> {target} ({len(response.content)} bytes)")
+
+        if stale:
+            raise CommandError(f"Stale or missing prerendered pages: {', '.join(stale)}")
+        verb = "Checked" if options["check"] else "Prerendered"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(settings.PRERENDERED_PAGES)} pages."))
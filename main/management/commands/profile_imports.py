@@ -0,0 +1,68 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.profiling import package_totals, parse_importtime, run_entry_point
+
+
+class Command(BaseCommand):
+    help = (
+        "Report what a cold interpreter imports before the WSGI entry point answers "
+        "its first request, parsed from python -X importtime"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entry", default="config.wsgi", help="Module exposing `application`")
+        parser.add_argument(
+            "--settings-module", default=None,
+            help="DJANGO_SETTINGS_MODULE for the child (default: the current one)",
+        )
+        parser.add_argument(
+            "--path", default="/test/",
+            help="Request served after import, so lazily loaded URLconfs and views count; '' to skip",
+        )
+        parser.add_argument("--top", type=int, default=25, help="Rows per table")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    def handle(self, *args, **options):
+        settings_module = options["settings_module"] or os.environ["DJANGO_SETTINGS_MODULE"]
+        try:
+            stats, stderr = run_entry_point(
+                options["entry"], settings_module, options["path"], importtime=True
+            )
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        rows = parse_importtime(stderr)
+        top = options["top"]
+        by_cumulative = sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+        by_self = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+        packages = package_totals(rows)[:top]
+
+        if options["json"]:
+            self.stdout.write(json.dumps({
+                "entry": options["entry"],
+                "settings": settings_module,
+                **stats,
+                "imported_modules": len(rows),
+                "top_cumulative": [{"module": m, "self_us": s, "cumulative_us": c} for m, s, c, _ in by_cumulative],
+                "top_self": [{"module": m, "self_us": s, "cumulative_us": c} for m, s, c, _ in by_self],
+                "packages": [{"package": p, "self_us": s} for p, s in packages],
+            }, indent=2))
+            return
+
+        self.stdout.write(
+            f"{options['entry']} ({settings_module}): {len(rows)} modules imported, "
+            f"import {stats['import_ms']:.0f} ms, first response {stats['first_response_ms']:.0f} ms "
+            f"({stats['status']})"
+        )
+        self.stdout.write(f"\nTop {top} packages by self time:")
+        for package, self_us in packages:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {package}")
+        self.stdout.write(f"\nTop {top} modules by cumulative time:")
+        for module, _, cumulative_us, _ in by_cumulative:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+        self.stdout.write(f"\nTop {top} modules by self time:")
+        for module, self_us, _, _ in by_self:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {module}")
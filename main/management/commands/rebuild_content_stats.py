@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from main.cache import bump_generation
+from main.models import Article, ContentStat, Event, Testimonial
+from main.snapshot import bump_content_version
+from main.stats import rebuild_content_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ContentStat counters from the Article, Event and Testimonial tables"
+
+    def handle(self, *args, **options):
+        rebuild_content_stats()
+        for model_class in (Article, Event, Testimonial):
+            bump_generation(model_class)
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {ContentStat.objects.count()} content stat buckets."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main import search
+
+
+class Command(BaseCommand):
+    help = "Repopulate the full-text search index from the Article, Solution and Event tables"
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError(
+                "No search index table in this database; run migrate on SQLite (FTS5) or PostgreSQL."
+            )
+        total = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} rows."))
@@ -0,0 +1,199 @@
+import json
+import time
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from main import search
+from main.cache import bump_generation
+from main.db import preserve_timestamps
+from main.snapshot import bump_content_version
+from main.stats import rebuild_content_stats, rebuild_inquiry_rollups
+
+CHUNK_SIZE = 1 << 16
+
+
+def iter_fixture(path):
+    """Yield the objects of a JSON array fixture one at a time.
+
+    Reads fixed-size chunks and decodes each element with ``raw_decode``,
+    so memory use depends on the largest single record, not the file size.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as fixture:
+        buffer = fixture.read(CHUNK_SIZE)
+        pos = 0
+        eof = False
+        started = False
+
+        while True:
+            # Skip whitespace and separators between elements.
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = fixture.read(CHUNK_SIZE), 0
+                eof = not buffer
+
+            if pos >= len(buffer):
+                raise CommandError(f"{path}: unexpected end of file")
+            if not started:
+                if buffer[pos] != "[":
+                    raise CommandError(f"{path}: expected a JSON array of objects")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise CommandError(f"{path}: malformed JSON near offset {pos}")
+                    chunk = fixture.read(CHUNK_SIZE)
+                    eof = not chunk
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    continue
+                break
+            yield obj
+            pos = end
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a Django JSON fixture (e.g. data.json) incrementally with bulk_create, "
+        "keeping memory flat regardless of file size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixture", help="Path to a JSON fixture in dumpdata format")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk_create call")
+        parser.add_argument(
+            "--transaction-rows", type=int, default=20000,
+            help="Rows committed per transaction",
+        )
+        parser.add_argument(
+            "--upsert", action="store_true",
+            help="Update rows whose primary key already exists instead of failing",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--skip-rebuild", action="store_true",
+            help="Do not rebuild the content stats, inquiry rollups and search index afterwards",
+        )
+
+    def handle(self, *args, **options):
+        self.using = options["database"]
+        self.batch_size = options["batch_size"]
+        self.upsert = options["upsert"]
+        self.loaded = Counter()
+        self.started = time.monotonic()
+        self.last_report = self.started
+
+        pending = defaultdict(list)
+        # Applied once every row is in, as loaddata does: the rows they
+        # point at may come later in the file, or in a later transaction.
+        self.m2m = []
+        self.deferred = []
+        in_transaction = 0
+        records = iter_fixture(options["fixture"])
+
+        while True:
+            with transaction.atomic(using=self.using):
+                for record in records:
+                    try:
+                        deserialized = next(Deserializer(
+                            [record], using=self.using, handle_forward_references=True,
+                        ))
+                    except DeserializationError as e:
+                        raise CommandError(f"Invalid record {record.get('model')}#{record.get('pk')}: {e}")
+                    obj = deserialized.object
+                    if deserialized.m2m_data:
+                        self.m2m.append((obj, deserialized.m2m_data))
+                    if deserialized.deferred_fields:
+                        self.deferred.append(deserialized)
+                    pending[type(obj)].append(obj)
+                    if len(pending[type(obj)]) >= self.batch_size:
+                        self.insert(type(obj), pending.pop(type(obj)))
+                    in_transaction += 1
+                    if in_transaction >= options["transaction_rows"]:
+                        break
+                else:
+                    records = None
+                for model_class in list(pending):
+                    self.insert(model_class, pending.pop(model_class))
+                in_transaction = 0
+            self.report()
+            if records is None:
+                break
+
+        self.save_relations()
+        self.reset_sequences()
+        if not options["skip_rebuild"]:
+            rebuild_content_stats(self.using)
+            if "main.Inquiry" in self.loaded:
+                rebuild_inquiry_rollups(self.using)
+            if search.is_available():
+                search.rebuild_index(using=self.using)
+        for model_class in self.loaded:
+            bump_generation(apps.get_model(model_class))
+        bump_content_version()
+
+        self.report(final=True)
+
+    def insert(self, model_class, objs):
+        kwargs = {"batch_size": self.batch_size}
+        if self.upsert:
+            kwargs.update(
+                update_conflicts=True,
+                unique_fields=[model_class._meta.pk.name],
+                update_fields=[
+                    field.name for field in model_class._meta.concrete_fields
+                    if not field.primary_key
+                ],
+            )
+        with preserve_timestamps(model_class):
+            model_class._default_manager.using(self.using).bulk_create(objs, **kwargs)
+        self.loaded[model_class._meta.label] += len(objs)
+
+    def save_relations(self):
+        """Set the many-to-many values and forward references held back during the load"""
+        with transaction.atomic(using=self.using):
+            for obj, m2m_data in self.m2m:
+                for name, values in m2m_data.items():
+                    getattr(obj, name).set(values)
+            for deserialized in self.deferred:
+                deserialized.save_deferred_fields(using=self.using)
+        self.m2m = self.deferred = []
+
+    def reset_sequences(self):
+        connection = connections[self.using]
+        model_classes = [apps.get_model(label) for label in self.loaded]
+        statements = connection.ops.sequence_reset_sql(no_style(), model_classes)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def report(self, final=False):
+        now = time.monotonic()
+        if not final and now - self.last_report < 5:
+            return
+        self.last_report = now
+        total = sum(self.loaded.values())
+        elapsed = max(now - self.started, 1e-9)
+        line = f"{total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)"
+        if final:
+            self.stdout.write(self.style.SUCCESS(f"Loaded {line}"))
+            for label, count in sorted(self.loaded.items()):
+                self.stdout.write(f"  {label}: {count}")
+        else:
+            self.stdout.write(line)
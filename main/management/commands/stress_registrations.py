@@ -0,0 +1,135 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from main.models import Event
+from main.registrations import SoldOut, register, seat_refresher
+
+from .bench_routes import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent registrations at one event, released together, and check that it is "
+        "never oversold and that double submits take one seat"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--registrations", type=int, default=500, help="Distinct registrations to attempt")
+        parser.add_argument("--concurrency", type=int, default=100, help="Threads registering at once")
+        parser.add_argument("--seats", type=int, default=100, help="Seats of the test event")
+        parser.add_argument("--waitlist", action="store_true", help="Waitlist registrations once sold out")
+        parser.add_argument(
+            "--duplicates", type=float, default=0.2,
+            help="Fraction of registrations submitted twice with the same idempotency key",
+        )
+        parser.add_argument(
+            "--event", type=int,
+            help="Register for this existing event instead of a temporary one (its seats are used up)",
+        )
+
+    def handle(self, *args, **options):
+        if options["event"]:
+            event = Event.objects.filter(pk=options["event"]).first()
+            if event is None:
+                raise CommandError(f"No event {options['event']}")
+            temporary = False
+        else:
+            event = Event.objects.create(
+                title="Registration stress test", description="Temporary event for stress_registrations",
+                event_type="masterclass", date=timezone.now(), location="Online", duration="1 hour",
+                spots_remaining=options["seats"], waitlist_enabled=options["waitlist"],
+            )
+            temporary = True
+
+        try:
+            self.run(event, options)
+        finally:
+            # The timer thread would die with the command.
+            seat_refresher.flush()
+            if temporary:
+                event.delete()
+
+    def run(self, event, options):
+        seats_before = event.spots_remaining
+        registered_before = event.registrations.filter(status="registered").count()
+
+        run_id = uuid.uuid4().hex[:12]
+        attempts = []
+        for index in range(options["registrations"]):
+            key = f"stress-{run_id}-{index}"
+            attempts.append(key)
+            if index < options["registrations"] * options["duplicates"]:
+                attempts.append(key)
+
+        barrier = threading.Barrier(options["concurrency"])
+        chunks = [attempts[i::options["concurrency"]] for i in range(options["concurrency"])]
+
+        def worker(keys):
+            results = []
+            try:
+                barrier.wait()
+                for key in keys:
+                    started = time.perf_counter()
+                    try:
+                        registration, created = register(
+                            event, full_name="Stress Test", email=f"{key}@example.com", idempotency_key=key,
+                        )
+                        outcome = registration.status if created else "duplicate"
+                    except SoldOut:
+                        outcome = "sold out"
+                    except Exception as e:
+                        outcome = f"error: {type(e).__name__}: {e}"
+                    results.append(((time.perf_counter() - started) * 1000, outcome))
+            finally:
+                connections.close_all()
+            return results
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as executor:
+            results = [result for chunk in executor.map(worker, chunks) for result in chunk]
+        elapsed = time.perf_counter() - started
+
+        outcomes = Counter(outcome for _, outcome in results)
+        latencies = [latency for latency, _ in results]
+        self.stdout.write(
+            f"{len(results)} submits ({options['registrations']} distinct) by {options['concurrency']} threads "
+            f"in {elapsed:.2f}s: {len(results) / elapsed:.0f}/s, "
+            f"p50 {percentile(latencies, 0.50):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms"
+        )
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+
+        event.refresh_from_db()
+        rows = Counter(
+            event.registrations.filter(idempotency_key__startswith=f"stress-{run_id}-")
+            .values_list("status", flat=True)
+        )
+        registered = event.registrations.filter(status="registered").count() - registered_before
+        problems = []
+        created = outcomes["registered"] + outcomes["waitlisted"]
+        if sum(rows.values()) != created:
+            problems.append(f"{sum(rows.values())} rows stored for {created} registrations")
+        if rows["registered"] != outcomes["registered"] or registered != outcomes["registered"]:
+            problems.append(f"{registered} registered rows, {outcomes['registered']} seats reported")
+        if seats_before is not None:
+            if registered > seats_before:
+                problems.append(f"oversold: {registered} seats taken of {seats_before}")
+            if event.spots_remaining != seats_before - registered:
+                problems.append(f"spots_remaining is {event.spots_remaining}, expected {seats_before - registered}")
+            if outcomes["registered"] < min(seats_before, options["registrations"]) and not any(
+                outcome.startswith("error") for outcome in outcomes
+            ):
+                problems.append(f"only {outcomes['registered']} seats sold of {seats_before} with demand left")
+        if problems:
+            raise CommandError("; ".join(problems))
+        self.stdout.write(self.style.SUCCESS(
+            f"Never oversold: {registered} of {seats_before if seats_before is not None else 'unlimited'} "
+            f"seats taken, {event.spots_remaining} left."
+        ))
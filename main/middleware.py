@@ -0,0 +1,168 @@
+"""Sampled per-request performance instrumentation.
+
+For a sampled request, ``PerformanceMiddleware`` records:
+- the total time,
+- the time spent in the database and the number of queries,
+- the number of repeated queries (same SQL and parameters),
+- the template render time, which main.templating's backend reports through
+  :func:`current_timings`.
+
+The figures are logged as one JSON line to the ``main`` logger and, with
+``PERF_SERVER_TIMING`` (off by default outside DEBUG), sent back in a
+``Server-Timing`` header. With ``PERF_SAMPLE_RATE = 0`` the
+middleware removes itself at startup; what remains is one context-variable
+lookup per query.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .db import pool_stats
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = ("db_ms", "template_ms", "template_depth", "queries", "_lock")
+
+    def __init__(self):
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.queries = Counter()
+        # Async views run their queries on several threads at once.
+        self._lock = threading.Lock()
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.queries.values())
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            # executemany parameter lists can be huge; count those by SQL alone.
+            key = sql if many else (sql, repr(params))
+            with self._lock:
+                self.db_ms += elapsed
+                self.queries[key] += 1
+
+
+def current_timings():
+    """The ``RequestTimings`` of the sampled request being served, else None"""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; times queries of sampled requests.
+
+    Connections are per thread, and a request's queries may run on worker
+    threads (async views) the middleware never sees, so the
+    wrapper stays in place and finds the request through the context
+    variable instead. Outside a sampled request it costs one lookup.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.record_query(execute, sql, params, many, context)
+
+
+def install_query_wrapper(connection):
+    """Add :func:`record_query` to ``connection``; signals.py does this for every new connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def collect_timings():
+    """Record the timings of the code in the block, including queries run on worker threads"""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PERF_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        return self.finish(request, response, timings, started)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, started)
+
+    def finish(self, request, response, timings, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        if settings.PERF_SERVER_TIMING:
+            response["Server-Timing"] = ", ".join([
+                f"total;dur={total_ms:.1f}",
+                f'db;dur={timings.db_ms:.1f};desc="{timings.query_count} queries, '
+                f'{timings.duplicate_count} duplicate"',
+                f"tpl;dur={timings.template_ms:.1f}",
+            ])
+        self.log(request, response, timings, total_ms)
+        return response
+
+    def log(self, request, response, timings, total_ms):
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(timings.db_ms, 2),
+            "queries": timings.query_count,
+            "duplicate_queries": timings.duplicate_count,
+            "template_ms": round(timings.template_ms, 2),
+            "db_pool": pool_stats(),
+        }
+        if total_ms >= settings.PERF_SLOW_REQUEST_MS:
+            logger.warning(f"slow request {json.dumps(record, default=str)}")
+        else:
+            logger.info(f"request timing {json.dumps(record, default=str)}")
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:30
+
+from django.db import migrations, models
+
+
+# Frozen copy of main.stats.TRACKED_MODELS as of this migration:
+# label -> (bucket field, visibility flag, optional rating field)
+TRACKED_MODELS = {
+    'main.article': ('category', 'is_published', None),
+    'main.event': ('event_type', 'is_active', None),
+    'main.testimonial': ('industry', 'is_active', 'rating'),
+}
+
+
+def populate_content_stats(apps, schema_editor):
+    ContentStat = apps.get_model('main', 'ContentStat')
+    using = schema_editor.connection.alias
+    for label, (field, flag, rating_field) in TRACKED_MODELS.items():
+        model_class = apps.get_model(label)
+        annotations = {'count': models.Count('pk')}
+        if rating_field:
+            annotations['rating_sum'] = models.Sum(rating_field)
+        rows = (
+            model_class.objects.using(using).filter(**{flag: True})
+            .order_by().values(field).annotate(**annotations)
+        )
+        ContentStat.objects.using(using).bulk_create([
+            ContentStat(
+                model_label=label,
+                bucket=row[field],
+                count=row['count'],
+                rating_sum=row.get('rating_sum') or 0,
+            )
+            for row in rows
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100)),
+                ('bucket', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model_label', 'bucket'), name='unique_content_stat_bucket')],
+            },
+        ),
+        migrations.RunPython(populate_content_stats, migrations.RunPython.noop),
+    ]
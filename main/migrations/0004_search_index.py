@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# Frozen copies of the main.search table layout and documents as of this
+# migration; later changes to main.search must not alter it.
+SEARCH_TABLE = "main_searchindex"
+
+# kind -> (model, visibility flag, title field, body fields)
+SEARCHABLE = {
+    "article": ("Article", "is_published", "title", ("description", "content", "author")),
+    "solution": ("Solution", "is_active", "title", ("description",)),
+    "event": ("Event", "is_active", "title", ("description", "location")),
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                "kind UNINDEXED, object_id UNINDEXED, visible UNINDEXED, title, body, "
+                "tokenize='porter unicode61')"
+            )
+        except Exception:
+            # SQLite built without FTS5: search falls back to icontains.
+            return
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE {SEARCH_TABLE} ("
+            "kind varchar(20) NOT NULL, object_id bigint NOT NULL, visible boolean NOT NULL, "
+            "title text NOT NULL, body text NOT NULL, "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', title), 'A') || "
+            "setweight(to_tsvector('english', body), 'B')) STORED, "
+            "PRIMARY KEY (kind, object_id))"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {SEARCH_TABLE}_document_idx ON {SEARCH_TABLE} USING GIN (document)"
+        )
+    else:
+        return
+
+    using = schema_editor.connection.alias
+    with schema_editor.connection.cursor() as cursor:
+        for kind, (model_name, flag, title_field, body_fields) in SEARCHABLE.items():
+            rows = apps.get_model("main", model_name).objects.using(using).order_by().values_list(
+                "pk", flag, title_field, *body_fields
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (kind, object_id, visible, title, body) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [
+                    [kind, pk, bool(visible), title, "\n".join(str(value or "") for value in body)]
+                    for pk, visible, title, *body in rows.iterator(chunk_size=500)
+                ],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:42
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def populate_inquiry_rollups(apps, schema_editor):
+    # Same rows as main.stats.rebuild_inquiry_rollups() at the time of this migration.
+    Inquiry = apps.get_model('main', 'Inquiry')
+    InquiryRollup = apps.get_model('main', 'InquiryRollup')
+    using = schema_editor.connection.alias
+
+    days = Inquiry.objects.using(using).order_by().annotate(day=TruncDate('created_at'))
+    rows = [
+        InquiryRollup(day=row['day'], dimension='all', value='', count=row['count'])
+        for row in days.values('day').annotate(count=models.Count('pk'))
+    ]
+    for dimension in ('country', 'job_title'):
+        counts = Counter()
+        for row in days.values('day', dimension).annotate(count=models.Count('pk')):
+            counts[row['day'], (row[dimension] or '').strip()] += row['count']
+        rows.extend(
+            InquiryRollup(day=day, dimension=dimension, value=value, count=count)
+            for (day, value), count in counts.items()
+        )
+    InquiryRollup.objects.using(using).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InquiryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('dimension', models.CharField(choices=[('all', 'All inquiries'), ('country', 'Country'), ('job_title', 'Job title')], max_length=20)),
+                ('value', models.CharField(blank=True, max_length=150)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'day', 'value'), name='unique_inquiry_rollup')],
+            },
+        ),
+        migrations.RunPython(populate_inquiry_rollups, migrations.RunPython.noop),
+    ]
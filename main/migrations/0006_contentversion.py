@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:59
+
+import time
+
+from django.db import migrations, models
+
+
+def create_content_version(apps, schema_editor):
+    # Start from a timestamp, like the cache generations, so a recreated
+    # database never reuses the stamp of a snapshot built from another one.
+    apps.get_model('main', 'ContentVersion').objects.create(pk=1, version=time.time_ns())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_inquiryrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_content_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_contentversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_enabled',
+            field=models.BooleanField(default=False, help_text='Take waitlist registrations once sold out'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='spots_remaining',
+            field=models.PositiveIntegerField(blank=True, help_text='Leave empty for unlimited seats', null=True),
+        ),
+        migrations.CreateModel(
+            name='EventRegistration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full_name', models.CharField(max_length=150)),
+                ('email', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('registered', 'Registered'), ('waitlisted', 'Waitlisted')], default='registered', max_length=20)),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='registrations', to='main.event')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['event', 'status', 'created_at'], name='registration_event_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'idempotency_key'), name='registration_event_key_uniq')],
+            },
+        ),
+    ]
@@ -16,6 +16,9 @@ class Inquiry(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="inquiry_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.full_name} - {self.email}"
@@ -45,6 +48,17 @@ class Solution(models.Model):
 
     class Meta:
         ordering = ["-is_featured", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-is_featured", "-created_at", "id"],
+                condition=models.Q(is_active=True),
+                name="solution_active_order_idx",
+            ),
+            models.Index(
+                fields=["is_active", "updated_at"],
+                name="solution_active_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -68,7 +82,8 @@ class Event(models.Model):
     location = models.CharField(max_length=200)
     duration = models.CharField(max_length=100, help_text="e.g., '2 Days', '4 hours'")
     price = models.CharField(max_length=50, default="Free")
-    spots_remaining = models.PositiveIntegerField(null=True, blank=True)
+    spots_remaining = models.PositiveIntegerField(null=True, blank=True, help_text="Leave empty for unlimited seats")
+    waitlist_enabled = models.BooleanField(default=False, help_text="Take waitlist registrations once sold out")
     is_featured = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -76,6 +91,17 @@ class Event(models.Model):
 
     class Meta:
         ordering = ["date"]
+        indexes = [
+            models.Index(
+                fields=["date", "id"],
+                condition=models.Q(is_active=True),
+                name="event_active_date_idx",
+            ),
+            models.Index(
+                fields=["is_active", "updated_at"],
+                name="event_active_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} - {self.date.strftime('%B %d, %Y')}"
@@ -108,6 +134,17 @@ class Article(models.Model):
 
     class Meta:
         ordering = ["-published_at"]
+        indexes = [
+            models.Index(
+                fields=["-published_at", "id"],
+                condition=models.Q(is_published=True),
+                name="article_published_idx",
+            ),
+            models.Index(
+                fields=["is_published", "updated_at"],
+                name="article_published_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -130,6 +167,12 @@ class GalleryImage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "id"], name="gallery_created_idx"),
+            models.Index(fields=["updated_at"], name="gallery_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -160,6 +203,17 @@ class Testimonial(models.Model):
 
     class Meta:
         ordering = ["-is_featured", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-is_featured", "-created_at", "id"],
+                condition=models.Q(is_active=True),
+                name="testimonial_active_order_idx",
+            ),
+            models.Index(
+                fields=["is_active", "updated_at"],
+                name="testimonial_active_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} - {self.company}"
@@ -178,6 +232,91 @@ class PricingPlan(models.Model):
 
     class Meta:
         ordering = ["price"]
+        indexes = [
+            models.Index(
+                fields=["price", "id"],
+                condition=models.Q(is_active=True),
+                name="pricingplan_active_price_idx",
+            ),
+            models.Index(fields=["is_active", "updated_at"], name="pricingplan_active_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
+
+
+class ContentStat(models.Model):
+    """Denormalized per-bucket counters for the public listing badges"""
+    model_label = models.CharField(max_length=100)
+    bucket = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model_label", "bucket"], name="unique_content_stat_bucket"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model_label}:{self.bucket} ({self.count})"
+
+
+class InquiryRollup(models.Model):
+    """Per-day inquiry counts, overall and by country / job title, for the dashboard"""
+    DIMENSION_CHOICES = [
+        ("all", "All inquiries"),
+        ("country", "Country"),
+        ("job_title", "Job title"),
+    ]
+
+    day = models.DateField()
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    value = models.CharField(max_length=150, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "day", "value"], name="unique_inquiry_rollup"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.dimension}:{self.value} ({self.count})"
+
+
+class ContentVersion(models.Model):
+    """Single-row stamp bumped on every change to public content (see main.snapshot)"""
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"content version {self.version}"
+
+
+class EventRegistration(models.Model):
+    """A seat (or waitlist place) taken through main.registrations"""
+    STATUS_CHOICES = [
+        ("registered", "Registered"),
+        ("waitlisted", "Waitlisted"),
+    ]
+
+    # registration_event_idx leads with event, so no separate index is needed.
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="registrations", db_index=False)
+    full_name = models.CharField(max_length=150)
+    email = models.EmailField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="registered")
+    # Sent with the form, so a resubmitted form finds its first registration.
+    # Unique per event: the same key posted to another event is a new registration.
+    idempotency_key = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["event", "status", "created_at"], name="registration_event_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "idempotency_key"], name="registration_event_key_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.full_name} - {self.event_id} ({self.status})"
@@ -0,0 +1,158 @@
+import base64
+import datetime
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of a keyset-paginated listing"""
+
+    def __init__(self, object_list, next_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_ordering(model_class):
+    """``Meta.ordering`` with an ``id`` tiebreak, so every row has a unique position"""
+    ordering = list(model_class._meta.ordering)
+    if not any(name.lstrip("-") in ("id", "pk") for name in ordering):
+        ordering.append("id")
+    return ordering
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps the microseconds DjangoJSONEncoder rounds off: a cursor must hit its row exactly"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    payload = json.dumps(values, cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, model_class, ordering):
+    """Turn an ``?after=`` token back into typed field values; ValueError if malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    try:
+        return [
+            model_class._meta.get_field(name.lstrip("-")).to_python(value)
+            for name, value in zip(ordering, values)
+        ]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def _after_filter(ordering, values):
+    """WHERE clause selecting rows strictly after ``values`` in ``ordering``.
+
+    Expands the row comparison into ``(a > x) OR (a = x AND b > y) ...`` so
+    mixed ascending/descending orderings work on every backend.
+    """
+    condition = Q()
+    equal = Q()
+    for name, value in zip(ordering, values):
+        field = name.lstrip("-")
+        lookup = "lt" if name.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{field}__{lookup}": value})
+        equal &= Q(**{field: value})
+    return condition
+
+
+def _row_value(row, name):
+    field = name.lstrip("-")
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, "pk" if field == "id" else field)
+
+
+def keyset_paginate(queryset, after=None, per_page=None):
+    """Return the page of ``queryset`` following the ``after`` cursor.
+
+    Seeks with an indexed range predicate instead of OFFSET, so every page
+    costs the same no matter how deep the visitor has scrolled. An invalid
+    cursor falls back to the first page.
+    """
+    per_page = per_page or settings.LISTING_PAGE_SIZE
+    ordering = keyset_ordering(queryset.model)
+    queryset = queryset.order_by(*ordering)
+
+    if after:
+        try:
+            values = decode_cursor(after, queryset.model, ordering)
+        except ValueError:
+            values = None
+        if values is not None:
+            queryset = queryset.filter(_after_filter(ordering, values))
+
+    rows = list(queryset[:per_page + 1])
+    if len(rows) <= per_page:
+        return KeysetPage(rows)
+    rows = rows[:per_page]
+    last = rows[-1]
+    return KeysetPage(rows, encode_cursor([_row_value(last, name) for name in ordering]))
+
+
+def _follows(row, ordering, values):
+    """Whether ``row`` sorts strictly after the cursor ``values`` in ``ordering``"""
+    for name, value in zip(ordering, values):
+        current = _row_value(row, name)
+        if current != value:
+            return current < value if name.startswith("-") else current > value
+    return False
+
+
+def keyset_paginate_sequence(rows, model_class, after=None, per_page=None):
+    """:func:`keyset_paginate` over an in-memory sequence.
+
+    ``rows`` must already be sorted by ``keyset_ordering(model_class)``; the
+    cursor is found by bisection and the tokens are interchangeable with the
+    queryset version's.
+    """
+    per_page = per_page or settings.LISTING_PAGE_SIZE
+    ordering = keyset_ordering(model_class)
+
+    start = 0
+    if after:
+        try:
+            values = decode_cursor(after, model_class, ordering)
+        except ValueError:
+            values = None
+        if values is not None:
+            low, high = 0, len(rows)
+            while low < high:
+                middle = (low + high) // 2
+                if _follows(rows[middle], ordering, values):
+                    high = middle
+                else:
+                    low = middle + 1
+            start = low
+
+    page = list(rows[start:start + per_page + 1])
+    if len(page) <= per_page:
+        return KeysetPage(page)
+    page = page[:per_page]
+    last = page[-1]
+    return KeysetPage(page, encode_cursor([_row_value(last, name) for name in ordering]))
@@ -0,0 +1,82 @@
+"""Helpers for measuring how long a fresh interpreter takes to serve a request.
+
+Both the import-time report and the startup benchmark run the WSGI entry
+point in a child process, so the numbers match a cold serverless instance
+rather than this already-warm management command.
+"""
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Executed with ``python -c``: import the entry point, then serve one GET.
+CHILD_SCRIPT = """
+import io, json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {base_dir!r})
+os.environ["DJANGO_SETTINGS_MODULE"] = {settings_module!r}
+import importlib
+application = importlib.import_module({entry!r}).application
+imported = time.perf_counter()
+status = []
+if {path!r}:
+    environ = {{
+        "REQUEST_METHOD": "GET", "PATH_INFO": {path!r}, "QUERY_STRING": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+        "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+    }}
+    body = b"".join(application(environ, lambda s, h, e=None: status.append(s)))
+responded = time.perf_counter()
+print("STARTUP " + json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_response_ms": (responded - started) * 1000,
+    "status": status[0] if status else None,
+    "modules": len(sys.modules),
+}}), flush=True)
+"""
+
+
+def run_entry_point(entry, settings_module, path="/test/", importtime=False):
+    """Start a fresh interpreter that imports ``entry`` and serves ``path``.
+
+    Returns ``(stats, stderr)``. ``stats`` is the dict the child reports.
+    With ``importtime`` the child runs under ``-X importtime``, and its
+    report is in ``stderr``.
+    """
+    script = CHILD_SCRIPT.format(
+        base_dir=str(settings.BASE_DIR), settings_module=settings_module, entry=entry, path=path,
+    )
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    result = subprocess.run(
+        command + ["-c", script], capture_output=True, text=True, cwd=settings.BASE_DIR,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            return json.loads(line[len("STARTUP "):]), result.stderr
+    raise RuntimeError(f"{entry} failed to start:\n{result.stderr[-2000:]}")
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into ``[(module, self_us, cumulative_us, depth)]``"""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def package_totals(rows):
+    """Sum the self time of every module by top-level package, largest first"""
+    totals = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        totals[module.split(".", 1)[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,107 @@
+"""Event registration with an atomic seat count and a waitlist."""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import bump_generation
+from .models import Event, EventRegistration
+from .snapshot import bump_content_version
+
+logger = logging.getLogger(__name__)
+
+
+class SoldOut(Exception):
+    """The event has no seats left and no waitlist"""
+
+
+def take_seat(event_id):
+    """Take one seat of an active event; False when none is left"""
+    return bool(
+        Event.objects.filter(pk=event_id, is_active=True)
+        .filter(Q(spots_remaining__gt=0) | Q(spots_remaining__isnull=True))
+        .update(spots_remaining=F("spots_remaining") - 1, updated_at=timezone.now())
+    )
+
+
+def seats_changed():
+    """Refresh the listings showing ``spots_remaining``; update() sends no signals"""
+    bump_content_version()
+    bump_generation(Event)
+
+
+class SeatRefresher:
+    """Runs :func:`seats_changed` once per ``SEAT_REFRESH_SECONDS``, however many seats went"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def schedule(self):
+        if settings.SEAT_REFRESH_SECONDS <= 0:
+            seats_changed()
+            return
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(settings.SEAT_REFRESH_SECONDS, self._refresh)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _refresh(self):
+        with self._lock:
+            self._timer = None
+        try:
+            seats_changed()
+        except Exception as e:
+            logger.error(f"Error refreshing event listings: {str(e)}")
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        """Refresh now if a refresh is pending"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            seats_changed()
+
+
+seat_refresher = SeatRefresher()
+
+
+def register(event, full_name, email, idempotency_key):
+    """Register for ``event``; returns ``(registration, created)``
+
+    Raises :class:`SoldOut` when there is neither a seat nor a waitlist.
+    """
+    existing = EventRegistration.objects.filter(event=event, idempotency_key=idempotency_key).first()
+    if existing is not None:
+        return existing, False
+    # Once a popular event sells out, most requests end here, without a write.
+    if not event.waitlist_enabled and Event.objects.filter(pk=event.pk, spots_remaining=0).exists():
+        raise SoldOut(f"{event} is sold out")
+
+    try:
+        with transaction.atomic():
+            registration = EventRegistration.objects.create(
+                event=event, full_name=full_name, email=email, idempotency_key=idempotency_key,
+            )
+            if take_seat(event.pk):
+                transaction.on_commit(seat_refresher.schedule)
+            elif event.waitlist_enabled:
+                registration.status = "waitlisted"
+                registration.save(update_fields=["status"])
+            else:
+                raise SoldOut(f"{event} is sold out")
+    except IntegrityError:
+        # Normally the same key committed first, from a concurrent submit;
+        # this transaction rolled back, seat included. Anything else (e.g.
+        # the event was deleted meanwhile) is not ours to swallow.
+        existing = EventRegistration.objects.filter(event=event, idempotency_key=idempotency_key).first()
+        if existing is None:
+            raise
+        return existing, False
+    return registration, True
@@ -0,0 +1,82 @@
+"""Budgeted reads that fall back to the last good result while the database is failing."""
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .cache import LocalLRUCache, skip_page_cache
+from .db import statement_budget
+
+logger = logging.getLogger(__name__)
+
+
+class ReadUnavailable(DatabaseError):
+    """A read failed or ran out of time and there was no fresh enough fallback"""
+
+
+class ResilientReader:
+    def __init__(self, size):
+        self._values = LocalLRUCache(size)  # key -> (value, stored_at)
+        self._failed_at = LocalLRUCache(size)  # key -> time of the last failure
+
+    def read(self, key, fetch, request=None):
+        """``fetch()``'s result, or the last good one for ``key`` if the database is failing
+
+        ``key`` must come from a bounded set (None keeps no fallback), or
+        clients could evict the real entries.
+        """
+        budget = settings.READ_BUDGET_SECONDS
+        if budget <= 0:
+            return fetch()
+
+        stale = self._values.get(key) if key is not None else None
+        if stale is not None and not self._usable(stale):
+            stale = None
+        if stale is not None:
+            failed_at = self._failed_at.get(key)
+            if failed_at is not None:
+                if time.monotonic() - failed_at < settings.READ_RETRY_SECONDS:
+                    return self._serve_stale(key, stale, "recent failure", request)
+                # This request probes the database; the others stay on the stale copy.
+                self._failed_at.set(key, time.monotonic())
+
+        try:
+            with statement_budget(budget):
+                value = fetch()
+        except DatabaseError as e:
+            if stale is None:
+                raise ReadUnavailable(f"Read {key!r} failed: {str(e)}") from e
+            self._failed_at.set(key, time.monotonic())
+            return self._serve_stale(key, stale, str(e), request)
+
+        if key is not None:
+            self._values.set(key, (value, time.time()))
+            self._failed_at.pop(key)
+        return value
+
+    def _usable(self, stale):
+        return time.time() - stale[1] <= settings.STALE_MAX_AGE_SECONDS
+
+    def _serve_stale(self, key, stale, reason, request):
+        logger.warning(f"Serving {key!r} from {time.time() - stale[1]:.0f}s ago: {reason}")
+        if request is not None:
+            skip_page_cache(request)
+        return stale[0]
+
+    def clear(self):
+        self._values.clear()
+        self._failed_at.clear()
+
+
+def first_page_key(name, after):
+    """Read key of a listing page: its first page only, as cursors are client-controlled"""
+    return None if after else name
+
+
+reader = ResilientReader(settings.READ_CACHE_SIZE)
+
+
+def read(key, fetch, request=None):
+    """Evaluate ``fetch()`` within ``READ_BUDGET_SECONDS``, falling back to the last good result"""
+    return reader.read(key, fetch, request)
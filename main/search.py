@@ -0,0 +1,218 @@
+"""Full-text search over articles, solutions and events.
+
+Rows live in one ``main_searchindex`` table: an FTS5 virtual table on the
+SQLite fallback and a regular table with a weighted ``tsvector`` column and
+a GIN index on PostgreSQL. Model signals keep it in step row by row, and
+``rebuild_search_index`` repopulates it from scratch. On other backends, or
+when the table is missing, lookups fall back to ``icontains`` filters.
+"""
+import re
+
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = "main_searchindex"
+
+# kind -> (model label, visibility flag, title field, body fields)
+SEARCHABLE = {
+    "article": ("main.Article", "is_published", "title", ("description", "content", "author")),
+    "solution": ("main.Solution", "is_active", "title", ("description",)),
+    "event": ("main.Event", "is_active", "title", ("description", "location")),
+}
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_available = None
+
+
+def kind_for(model_class):
+    label = model_class._meta.label
+    for kind, (model_label, *_) in SEARCHABLE.items():
+        if model_label == label:
+            return kind
+    return None
+
+
+def is_available():
+    """True when the backend-specific index table exists in this database"""
+    global _available
+    if _available is None:
+        _available = (
+            connection.vendor in ("sqlite", "postgresql")
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available
+
+
+def reset_availability():
+    """Forget the cached table check, e.g. after migrations ran in this process"""
+    global _available
+    _available = None
+
+
+def _document(instance, kind):
+    _, flag, title_field, body_fields = SEARCHABLE[kind]
+    body = "\n".join(str(getattr(instance, name) or "") for name in body_fields)
+    return [kind, instance.pk, bool(getattr(instance, flag)), getattr(instance, title_field), body]
+
+
+def index_instance(instance):
+    """Insert or replace the index row for ``instance``"""
+    kind = kind_for(type(instance))
+    if kind is None or not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s", [kind, instance.pk]
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, visible, title, body) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            _document(instance, kind),
+        )
+
+
+def remove_instance(instance):
+    kind = kind_for(type(instance))
+    if kind is None or not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id = %s", [kind, instance.pk]
+        )
+
+
+def _connection(using):
+    from django.db import connections
+
+    return connections[using]
+
+
+def rebuild_index(using="default", batch_size=500):
+    """Repopulate the whole index"""
+    from django.apps import apps
+
+    conn = _connection(using)
+    if SEARCH_TABLE not in conn.introspection.table_names():
+        return 0
+
+    total = 0
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        for kind, (label, flag, title_field, body_fields) in SEARCHABLE.items():
+            model_class = apps.get_model(label)
+            rows = model_class._default_manager.using(using).order_by().values_list(
+                "pk", flag, title_field, *body_fields
+            )
+            batch = []
+            for pk, visible, title, *body in rows.iterator(chunk_size=batch_size):
+                body = "\n".join(str(value or "") for value in body)
+                batch.append([kind, pk, bool(visible), title, body])
+                if len(batch) >= batch_size:
+                    _insert_many(cursor, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                _insert_many(cursor, batch)
+                total += len(batch)
+    return total
+
+
+def _insert_many(cursor, rows):
+    cursor.executemany(
+        f"INSERT INTO {SEARCH_TABLE} (kind, object_id, visible, title, body) "
+        "VALUES (%s, %s, %s, %s, %s)",
+        rows,
+    )
+
+
+def _match_clause(query):
+    """Backend-specific ``(where_sql, params, rank_sql)``; None if nothing to search"""
+    words = WORD_RE.findall(query)
+    if not words:
+        return None
+    if connection.vendor == "sqlite":
+        # Quote every term so user input can never be parsed as FTS5 syntax.
+        match = " ".join(f'"{word}"*' for word in words)
+        return (
+            f"{SEARCH_TABLE} MATCH %s", [match],
+            f"bm25({SEARCH_TABLE}, 0, 0, 0, 10.0, 1.0)",
+        )
+    return (
+        "document @@ websearch_to_tsquery('english', %s)", [" ".join(words)],
+        "-ts_rank(document, websearch_to_tsquery('english', %s))",
+    )
+
+
+def search(query, kinds=None, limit=20, visible_only=True):
+    """Return ``[(kind, object_id)]`` ranked by relevance, best first"""
+    clause = _match_clause(query)
+    if clause is None or not is_available():
+        return []
+    where, params, rank = clause
+    kinds = list(kinds or SEARCHABLE)
+    sql = (
+        f"SELECT kind, object_id FROM {SEARCH_TABLE} WHERE {where} "
+        f"AND kind IN ({', '.join(['%s'] * len(kinds))})"
+    )
+    params = params + kinds
+    if visible_only:
+        sql += " AND visible"
+    rank_params = params[:1] if connection.vendor == "postgresql" else []
+    sql += f" ORDER BY {rank} LIMIT %s"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + rank_params + [limit])
+        return [(kind, int(object_id)) for kind, object_id in cursor.fetchall()]
+
+
+def search_objects(query, limit=20):
+    """Ranked, visible model instances matching ``query``; ``icontains`` fallback"""
+    from django.apps import apps
+
+    if not is_available():
+        return _fallback_objects(query, limit)
+
+    hits = search(query, limit=limit)
+    loaded = {}
+    for kind in {kind for kind, _ in hits}:
+        model_class = apps.get_model(SEARCHABLE[kind][0])
+        ids = [object_id for hit_kind, object_id in hits if hit_kind == kind]
+        queryset = model_class.objects.all()
+        if kind == "article":
+            queryset = queryset.defer("content")
+        loaded[kind] = queryset.in_bulk(ids)
+    return [
+        (kind, loaded[kind][object_id])
+        for kind, object_id in hits
+        if object_id in loaded.get(kind, {})
+    ]
+
+
+def _fallback_objects(query, limit):
+    from django.apps import apps
+
+    query = query.strip()
+    if not query:
+        return []
+    results = []
+    for kind, (label, flag, title_field, body_fields) in SEARCHABLE.items():
+        model_class = apps.get_model(label)
+        condition = models.Q(**{f"{title_field}__icontains": query})
+        for name in body_fields:
+            condition |= models.Q(**{f"{name}__icontains": query})
+        queryset = model_class.objects.filter(condition, **{flag: True})
+        results.extend((kind, obj) for obj in queryset[:limit])
+    return results[:limit]
+
+
+def filter_queryset(queryset, query):
+    """Restrict ``queryset`` to rows whose index entry matches ``query`` (admin search)"""
+    kind = kind_for(queryset.model)
+    clause = _match_clause(query)
+    if kind is None or clause is None or not is_available():
+        return None
+    where, params, _ = clause
+    return queryset.filter(pk__in=RawSQL(
+        f"SELECT object_id FROM {SEARCH_TABLE} WHERE {where} AND kind = %s",
+        params + [kind],
+    ))
@@ -0,0 +1,152 @@
+from collections import Counter
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_generation
+from . import db, images, middleware, search, snapshot
+from .models import (
+    Article, ContentStat, ContentVersion, Event, GalleryImage, Inquiry, InquiryRollup, Solution,
+    Testimonial,
+)
+from .stats import (
+    TRACKED_MODELS, apply_delta, apply_rollup_deltas, contribution, record_inquiries, rollup_keys,
+)
+
+
+@receiver(pre_save, sender=Article)
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=Testimonial)
+def remember_stat_contribution(sender, instance, **kwargs):
+    """Stash what the stored row counted towards before it is overwritten"""
+    instance._stat_contribution = None
+    if instance.pk is None:
+        return
+    names = [name for name in TRACKED_MODELS[sender._meta.label_lower] if name]
+    values = sender._default_manager.filter(pk=instance.pk).values(*names).first()
+    if values is not None:
+        instance._stat_contribution = contribution(instance, values)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Testimonial)
+def update_stats_on_save(sender, instance, **kwargs):
+    # Fixture rows (raw saves) are counted too, so loaddata leaves the badges right.
+    before = getattr(instance, '_stat_contribution', None)
+    after = contribution(instance)
+    if before == after:
+        return
+    label = sender._meta.label_lower
+    if before is not None:
+        apply_delta(label, before[0], -1, -before[1])
+    if after is not None:
+        apply_delta(label, after[0], 1, after[1])
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Testimonial)
+def update_stats_on_delete(sender, instance, **kwargs):
+    current = contribution(instance)
+    if current is not None:
+        apply_delta(sender._meta.label_lower, current[0], -1, -current[1])
+
+
+@receiver(pre_save, sender=Inquiry)
+def remember_rollup_keys(sender, instance, **kwargs):
+    """Stash the rollup rows the stored inquiry counts towards before an edit"""
+    instance._rollup_keys = []
+    if instance.pk is None:
+        return
+    stored = sender._default_manager.filter(pk=instance.pk).only(
+        'created_at', 'country', 'job_title'
+    ).first()
+    if stored is not None:
+        instance._rollup_keys = rollup_keys(stored)
+
+
+@receiver(post_save, sender=Inquiry)
+def update_rollups_on_save(sender, instance, **kwargs):
+    # Fixture rows (raw saves) are counted too, so loaddata leaves the dashboard right.
+    deltas = Counter(rollup_keys(instance))
+    deltas.subtract(getattr(instance, '_rollup_keys', []))
+    apply_rollup_deltas(deltas)
+
+
+@receiver(post_delete, sender=Inquiry)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    record_inquiries([instance], sign=-1)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_page_generation(sender, **kwargs):
+    """Retire cached pages that render rows of the changed model"""
+    if sender._meta.app_label != 'main' or sender in (ContentStat, ContentVersion, InquiryRollup):
+        return
+    bump_generation(sender)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_content_version(sender, **kwargs):
+    """Retire the content snapshot when a row of a snapshot model changes"""
+    if sender in snapshot.SNAPSHOT_MODELS:
+        snapshot.bump_content_version()
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def discard_article_page(sender, instance, **kwargs):
+    """Drop the cached detail page of a saved, unpublished or deleted article"""
+    from .views import article_pages
+
+    article_pages.discard_matching(lambda entry: entry[0] == instance.pk)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Solution)
+@receiver(post_save, sender=Event)
+def update_search_index(sender, instance, **kwargs):
+    search.index_instance(instance)
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Solution)
+@receiver(post_delete, sender=Event)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_instance(instance)
+
+
+@receiver(pre_save, sender=Article)
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=GalleryImage)
+@receiver(pre_save, sender=Solution)
+def remember_new_uploads(sender, instance, raw=False, **kwargs):
+    """Note which image fields hold a file that this save is about to store"""
+    instance._new_uploads = [] if raw else [
+        name for name in images.IMAGE_FIELDS[sender._meta.label]
+        if getattr(instance, name) and not getattr(instance, name)._committed
+    ]
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=GalleryImage)
+@receiver(post_save, sender=Solution)
+def generate_image_variants(sender, instance, **kwargs):
+    for name in getattr(instance, '_new_uploads', []):
+        images.schedule_variants(getattr(instance, name).name, sender)
+
+
+@receiver(connection_created)
+def count_database_connection(sender, connection, **kwargs):
+    db.record_connection(connection)
+    middleware.install_query_wrapper(connection)
+
+
+@receiver(post_migrate)
+def recheck_search_index(sender, **kwargs):
+    search.reset_availability()
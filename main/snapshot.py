@@ -0,0 +1,327 @@
+"""Immutable in-memory snapshot of the public listings, stamped with ``ContentVersion``."""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from glob import glob
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from .cache import model_generations
+from .models import (
+    Article, ContentVersion, Event, GalleryImage, PricingPlan, Solution, Testimonial,
+)
+from .pagination import keyset_ordering, keyset_paginate, keyset_paginate_sequence
+from .stats import TRACKED_MODELS, content_stats
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent builds are merely wasteful
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Model -> (filter selecting its public rows, columns left out of the records)
+SNAPSHOT_MODELS = {
+    Solution: ({"is_active": True}, ()),
+    Event: ({"is_active": True}, ()),
+    Article: ({"is_published": True}, ("content",)),
+    Testimonial: ({"is_active": True}, ()),
+    PricingPlan: ({"is_active": True}, ()),
+    GalleryImage: ({}, ()),
+}
+
+
+def public_queryset(model_class):
+    return model_class._default_manager.filter(**SNAPSHOT_MODELS[model_class][0])
+
+
+def content_version():
+    """The current ``ContentVersion`` stamp, creating the row if it is missing"""
+    version = ContentVersion.objects.filter(pk=1).values_list("version", flat=True).first()
+    if version is None:
+        version = ContentVersion.objects.get_or_create(
+            pk=1, defaults={"version": time.time_ns()}
+        )[0].version
+    return version
+
+
+def bump_content_version():
+    """Mark the snapshot stale in every process"""
+    # A timestamp rather than version + 1: a rolled-back bump may already have a snapshot built at it.
+    bumped = Greatest(F("version") + 1, Value(time.time_ns()))
+    if not ContentVersion.objects.filter(pk=1).update(version=bumped):
+        content_version()
+
+
+class ImageRef:
+    """Stand-in for an ImageField file: truthy, with ``name`` and ``url``"""
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __bool__(self):
+        return bool(self.name)
+
+    @property
+    def url(self):
+        return default_storage.url(self.name)
+
+    def __str__(self):
+        return self.name
+
+
+class Record:
+    """Read-only copy of one row, holding the snapshot columns in ``__slots__``"""
+    __slots__ = ()
+    model = None
+
+    def __init__(self, values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.pk}>"
+
+
+def _display(name, choices):
+    def get_display(self):
+        value = getattr(self, name)
+        return choices.get(value, value)
+    return get_display
+
+
+def snapshot_fields(model_class):
+    excluded = SNAPSHOT_MODELS[model_class][1]
+    return [field for field in model_class._meta.concrete_fields if field.name not in excluded]
+
+
+def record_class(model_class):
+    """A ``Record`` subclass mirroring ``model_class``: its fields, ``get_FOO_display`` and ``__str__``"""
+    fields = snapshot_fields(model_class)
+    namespace = {
+        "__slots__": tuple(field.attname for field in fields),
+        "__module__": __name__,
+        "__str__": model_class.__str__,
+        "model": model_class,
+    }
+    for field in fields:
+        if field.choices:
+            namespace[f"get_{field.name}_display"] = _display(field.attname, dict(field.flatchoices))
+    return type(f"{model_class.__name__}Record", (Record,), namespace)
+
+
+RECORD_CLASSES = {model_class: record_class(model_class) for model_class in SNAPSHOT_MODELS}
+
+# Part of the file name, so a deploy that adds a column never loads rows
+# pickled by the previous code for the same ContentVersion.
+LAYOUT = hashlib.sha1(repr([
+    (model_class._meta.label, record.__slots__) for model_class, record in RECORD_CLASSES.items()
+]).encode()).hexdigest()[:8]
+
+
+def build_tables():
+    """Read every snapshot model; plain tuples keep the pickle small and fast to load"""
+    tables = {}
+    for model_class in SNAPSHOT_MODELS:
+        fields = snapshot_fields(model_class)
+        ordering = keyset_ordering(model_class)
+        queryset = public_queryset(model_class).order_by()
+        rows = list(queryset.values_list(*[field.attname for field in fields]))
+        # Sort in Python too, so bisection agrees with the stored order
+        # whatever the database collation.
+        positions = {field.attname: index for index, field in enumerate(fields)}
+        for name in reversed(ordering):
+            index = positions[name.lstrip("-")]
+            rows.sort(key=lambda row: row[index], reverse=name.startswith("-"))
+
+        fingerprint = queryset.aggregate(latest=models.Max("updated_at"), count=models.Count("pk"))
+        stats = content_stats(model_class) if model_class._meta.label_lower in TRACKED_MODELS else None
+        tables[model_class._meta.label] = (rows, (fingerprint["count"], fingerprint["latest"]), stats)
+    return tables
+
+
+class ContentSnapshot:
+    """Records, listing fingerprints and badge stats of one ``ContentVersion``"""
+
+    def __init__(self, version, tables):
+        self.version = version
+        self.rows = {}
+        self.fingerprints = {}
+        self.stats = {}
+        for model_class, record in RECORD_CLASSES.items():
+            rows, fingerprint, stats = tables[model_class._meta.label]
+            images = [
+                index for index, field in enumerate(snapshot_fields(model_class))
+                if isinstance(field, models.FileField)
+            ]
+            if images:
+                rows = [list(row) for row in rows]
+                for row in rows:
+                    for index in images:
+                        row[index] = ImageRef(row[index]) if row[index] else None
+            self.rows[model_class] = tuple(record(row) for row in rows)
+            self.fingerprints[model_class] = fingerprint
+            self.stats[model_class] = stats
+
+
+class SnapshotStore:
+    """Per-process holder of the current ``ContentSnapshot``"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._generations = None
+
+    def get(self):
+        generations = model_generations(*SNAPSHOT_MODELS)
+        if (
+            self._snapshot is not None
+            and generations == self._generations
+            and time.monotonic() - self._checked_at < settings.CONTENT_SNAPSHOT_CHECK_SECONDS
+        ):
+            return self._snapshot
+
+        with self._lock:
+            try:
+                version = content_version()
+                if self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = ContentSnapshot(version, self._load(version))
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                logger.error(f"Error refreshing content snapshot: {str(e)}")
+            self._checked_at = time.monotonic()
+            self._generations = generations
+            return self._snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _path(self, version):
+        return os.path.join(settings.CONTENT_SNAPSHOT_DIR, f"content-{version}-{LAYOUT}.pickle")
+
+    def _load(self, version):
+        try:
+            private_directory(settings.CONTENT_SNAPSHOT_DIR)
+        except (OSError, SuspiciousFileOperation) as e:
+            logger.error(f"Error using snapshot directory: {str(e)}")
+            return build_tables()
+        path = self._path(version)
+        if not os.path.exists(path):
+            self._build(version, path)
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        with os.fdopen(fd, "rb") as f:
+            try:
+                check_private(path, os.fstat(fd))
+            except SuspiciousFileOperation as e:
+                logger.error(f"Error loading content snapshot: {str(e)}")
+                return build_tables()
+            return pickle.load(f)
+
+    def _build(self, version, path):
+        with open(os.path.join(settings.CONTENT_SNAPSHOT_DIR, "build.lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            if os.path.exists(path):
+                return  # another worker built it while we waited
+
+            started = time.perf_counter()
+            payload = pickle.dumps(build_tables(), protocol=pickle.HIGHEST_PROTOCOL)
+            fd, tmp_path = tempfile.mkstemp(dir=settings.CONTENT_SNAPSHOT_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            logger.info(
+                f"Built content snapshot {version}: {len(payload)} bytes "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+
+            for stale in glob(os.path.join(settings.CONTENT_SNAPSHOT_DIR, "content-*.pickle")):
+                if stale != path:
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+
+
+def check_private(path, stat):
+    """Raise SuspiciousFileOperation unless ``stat`` is owned by us and not writable by group or others"""
+    if not hasattr(os, "getuid"):
+        return  # Windows: permissions are ACLs, which st_mode does not reflect
+    if stat.st_uid != os.getuid():
+        raise SuspiciousFileOperation(f"{path} is owned by uid {stat.st_uid}, not {os.getuid()}")
+    if stat.st_mode & 0o022:
+        raise SuspiciousFileOperation(f"{path} is writable by group or others (mode {stat.st_mode & 0o777:o})")
+
+
+def private_directory(path):
+    """Create ``path`` with mode 0700 if missing, and check nobody else can plant files in it"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    check_private(path, os.stat(path))
+
+
+content_snapshot = SnapshotStore()
+
+
+def _snapshot_for(queryset):
+    """The current snapshot if it holds exactly the rows of ``queryset``, else None"""
+    if not settings.CONTENT_SNAPSHOT or queryset.model not in SNAPSHOT_MODELS:
+        return None
+    if queryset.query.where != public_queryset(queryset.model).query.where:
+        return None
+    return content_snapshot.get()
+
+
+def listing_page(queryset, after=None):
+    """Keyset page of a public listing, from the snapshot when it covers ``queryset``"""
+    snapshot = _snapshot_for(queryset)
+    if snapshot is None:
+        return keyset_paginate(queryset, after=after)
+    return keyset_paginate_sequence(snapshot.rows[queryset.model], queryset.model, after=after)
+
+
+def listing_rows(queryset):
+    snapshot = _snapshot_for(queryset)
+    return queryset if snapshot is None else snapshot.rows[queryset.model]
+
+
+def listing_featured(queryset):
+    """The first ``FEATURED_LIMIT`` featured rows of a public listing, independent of the page shown"""
+    snapshot = _snapshot_for(queryset)
+    if snapshot is None:
+        featured = queryset.filter(is_featured=True).order_by(*keyset_ordering(queryset.model))
+        return list(featured[:settings.FEATURED_LIMIT])
+    return list(islice((row for row in snapshot.rows[queryset.model] if row.is_featured), settings.FEATURED_LIMIT))
+
+
+def listing_stats(model_class):
+    """:func:`main.stats.content_stats`, read from the snapshot when enabled"""
+    if not settings.CONTENT_SNAPSHOT:
+        return content_stats(model_class)
+    return content_snapshot.get().stats[model_class]
+
+
+def listing_fingerprint(queryset):
+    """``(count, latest updated_at)`` of ``queryset`` from the snapshot, or None"""
+    snapshot = _snapshot_for(queryset)
+    return None if snapshot is None else snapshot.fingerprints[queryset.model]
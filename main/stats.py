@@ -0,0 +1,225 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+# Bucket field, visibility flag and optional rating field for every model
+# whose listing page shows per-choice badges.
+TRACKED_MODELS = {
+    'main.article': ('category', 'is_published', None),
+    'main.event': ('event_type', 'is_active', None),
+    'main.testimonial': ('industry', 'is_active', 'rating'),
+}
+
+
+def content_stats(model_class):
+    """Read the denormalized badges for ``model_class`` from ``ContentStat``.
+
+    Returns ``{value: count}``, or ``{value: {'count': n, 'avg_rating': x}}``
+    for models with a rating field. Keys follow the order of the field's
+    choices so templates render badges in a stable order.
+    """
+    from .models import ContentStat
+
+    field, _, rating_field = TRACKED_MODELS[model_class._meta.label_lower]
+    rows = {
+        stat.bucket: stat
+        for stat in ContentStat.objects.filter(
+            model_label=model_class._meta.label_lower, count__gt=0
+        )
+    }
+
+    stats = {}
+    for value, _ in model_class._meta.get_field(field).choices:
+        stat = rows.get(value)
+        if stat is None:
+            continue
+        if rating_field:
+            stats[value] = {
+                'count': stat.count,
+                'avg_rating': round(stat.rating_sum / stat.count, 1),
+            }
+        else:
+            stats[value] = stat.count
+    return stats
+
+
+def contribution(instance, values=None):
+    """Return ``(bucket, rating)`` counted for ``instance``, or None if hidden.
+
+    ``values`` may be a dict of previously stored field values, used to work
+    out what a row contributed before it was edited.
+    """
+    field, flag, rating_field = TRACKED_MODELS[instance._meta.label_lower]
+    if values is None:
+        values = {name: getattr(instance, name) for name in (field, flag, rating_field) if name}
+    if not values[flag]:
+        return None
+    return values[field], values[rating_field] if rating_field else 0
+
+
+def apply_delta(label, bucket, count, rating):
+    """Atomically add ``count``/``rating`` to one ``ContentStat`` bucket"""
+    from .models import ContentStat
+
+    updated = ContentStat.objects.filter(model_label=label, bucket=bucket).update(
+        count=models.F('count') + count,
+        rating_sum=models.F('rating_sum') + rating,
+    )
+    if not updated:
+        stat, created = ContentStat.objects.get_or_create(
+            model_label=label, bucket=bucket,
+            defaults={'count': count, 'rating_sum': rating},
+        )
+        if not created:
+            apply_delta(label, bucket, count, rating)
+
+
+def rebuild_content_stats(using=DEFAULT_DB_ALIAS):
+    """Recompute every ``ContentStat`` row from the content tables"""
+    from django.apps import apps
+    from .models import ContentStat
+
+    with transaction.atomic(using=using):
+        ContentStat.objects.using(using).all().delete()
+        for label, (field, flag, rating_field) in TRACKED_MODELS.items():
+            model_class = apps.get_model(label)
+            annotations = {'count': models.Count('pk')}
+            if rating_field:
+                annotations['rating_sum'] = models.Sum(rating_field)
+            rows = (
+                model_class.objects.using(using).filter(**{flag: True})
+                .order_by().values(field).annotate(**annotations)
+            )
+            ContentStat.objects.using(using).bulk_create([
+                ContentStat(
+                    model_label=label,
+                    bucket=row[field],
+                    count=row['count'],
+                    rating_sum=row.get('rating_sum') or 0,
+                )
+                for row in rows
+            ])
+
+
+# Inquiry fields broken down on the dashboard, besides the overall count.
+ROLLUP_DIMENSIONS = ('country', 'job_title')
+INQUIRY_SUMMARY_KEY = 'main:inquiry-summary:{}'
+
+
+def rollup_keys(inquiry):
+    """Return the ``(day, dimension, value)`` rollup rows ``inquiry`` counts towards"""
+    day = timezone.localdate(inquiry.created_at)
+    keys = [(day, 'all', '')]
+    for dimension in ROLLUP_DIMENSIONS:
+        keys.append((day, dimension, (getattr(inquiry, dimension) or '').strip()))
+    return keys
+
+
+def add_to_rollup(day, dimension, value, count):
+    """Atomically add ``count`` to one ``InquiryRollup`` row"""
+    from .models import InquiryRollup
+
+    updated = InquiryRollup.objects.filter(day=day, dimension=dimension, value=value).update(
+        count=models.F('count') + count,
+    )
+    if not updated:
+        rollup, created = InquiryRollup.objects.get_or_create(
+            day=day, dimension=dimension, value=value, defaults={'count': count},
+        )
+        if not created:
+            add_to_rollup(day, dimension, value, count)
+
+
+def apply_rollup_deltas(deltas):
+    """Apply a ``{(day, dimension, value): count}`` mapping in one transaction"""
+    with transaction.atomic():
+        for (day, dimension, value), count in sorted(deltas.items()):
+            if count:
+                add_to_rollup(day, dimension, value, count)
+
+
+def record_inquiries(inquiries, sign=1):
+    """Count saved (or, with ``sign=-1``, deleted) inquiries into the rollups.
+
+    Rows are grouped first, so a bulk insert of n inquiries costs one
+    update per distinct day/country/job title rather than 3n.
+    """
+    deltas = Counter()
+    for inquiry in inquiries:
+        for key in rollup_keys(inquiry):
+            deltas[key] += sign
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_inquiry_rollups(using=DEFAULT_DB_ALIAS):
+    """Recompute every ``InquiryRollup`` row from the inquiries table"""
+    from .models import Inquiry, InquiryRollup
+
+    with transaction.atomic(using=using):
+        InquiryRollup.objects.using(using).all().delete()
+        days = Inquiry.objects.using(using).order_by().annotate(day=TruncDate('created_at'))
+        rows = [
+            InquiryRollup(day=row['day'], dimension='all', value='', count=row['count'])
+            for row in days.values('day').annotate(count=models.Count('pk'))
+        ]
+        for dimension in ROLLUP_DIMENSIONS:
+            # Values are stripped to match rollup_keys(); collapse the duplicates.
+            counts = Counter()
+            for row in days.values('day', dimension).annotate(count=models.Count('pk')):
+                counts[row['day'], (row[dimension] or '').strip()] += row['count']
+            rows.extend(
+                InquiryRollup(day=day, dimension=dimension, value=value, count=count)
+                for (day, value), count in counts.items()
+            )
+        InquiryRollup.objects.using(using).bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def inquiry_summary(days=14, top=5):
+    """Dashboard figures read from ``InquiryRollup`` and cached per Inquiry generation.
+
+    Returns the overall, weekly and daily totals, a ``days``-long trend
+    (oldest first, zero-filled) and the ``top`` countries and job titles.
+    """
+    from .cache import model_generations
+    from .models import Inquiry, InquiryRollup
+
+    today = timezone.localdate()
+    key = INQUIRY_SUMMARY_KEY.format(model_generations(Inquiry)[0])
+    summary = cache.get(key)
+    if summary is not None and summary['today'] == today:
+        return summary
+
+    start = today - timedelta(days=days - 1)
+    per_day = dict(
+        InquiryRollup.objects.filter(dimension='all', day__gte=start).values_list('day', 'count')
+    )
+    trend = [(start + timedelta(days=n), per_day.get(start + timedelta(days=n), 0)) for n in range(days)]
+    peak = max([count for _, count in trend] + [1])
+
+    summary = {
+        'today': today,
+        'total': InquiryRollup.objects.filter(dimension='all').aggregate(
+            total=models.Sum('count'))['total'] or 0,
+        'this_week': sum(count for day, count in trend if day > today - timedelta(days=7)),
+        'today_count': per_day.get(today, 0),
+        'trend': [
+            {'day': day, 'count': count, 'percent': round(100 * count / peak)}
+            for day, count in trend
+        ],
+    }
+    for dimension in ROLLUP_DIMENSIONS:
+        summary[f'top_{dimension}'] = list(
+            InquiryRollup.objects.filter(dimension=dimension)
+            .exclude(value='')
+            .values('value')
+            .annotate(total=models.Sum('count'))
+            .order_by('-total', 'value')[:top]
+        )
+    cache.set(key, summary, 300)
+    return summary
@@ -0,0 +1,245 @@
+"""Reproducible synthetic content for scale testing (see ``generate_content``).
+
+Every row is built from a ``random.Random`` reseeded with ``(seed, model,
+row index)``. The same seed therefore always yields the same rows, whatever
+the batch size, the number of workers or the order the batches run in. Choice fields follow a skewed (Zipf-like)
+distribution over the model's own choices, and JSON fields keep the shapes
+of the hand-written fixture.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+FIRST_NAMES = [
+    "Sophia", "Liam", "Olivia", "Noah", "Amelia", "Arjun", "Mei", "Carlos", "Fatima", "Kenji",
+    "Aisha", "Lucas", "Priya", "Mateo", "Chloe", "Omar", "Hannah", "Ravi", "Elena", "Jonas",
+]
+LAST_NAMES = [
+    "James", "Smith", "Patel", "Garcia", "Chen", "Nguyen", "Okafor", "Silva", "Kowalski", "Tanaka",
+    "Muller", "Haddad", "Thapa", "Rossi", "Brown", "Khan", "Sato", "Novak", "Andersen", "Lopez",
+]
+COMPANIES = [
+    "RetailX", "MediCore", "FinSight", "LogiTrack", "EduNova", "SteelWorks", "CloudPeak", "AgriSense",
+    "UrbanGrid", "DocuMind", "SafeOps", "Laundriq", "Nimbus Labs", "Brightline", "Northwind",
+]
+COUNTRIES = [
+    "United Kingdom", "USA", "Nepal", "India", "Germany", "Australia", "Canada", "Mexico",
+    "France", "Japan", "Brazil", "Nigeria", "Netherlands", "Singapore", "Spain",
+]
+JOB_TITLES = [
+    "CTO", "Head of Analytics", "AI Project Manager", "Product Owner", "Ops Manager", "CEO",
+    "Data Scientist", "Engineering Manager", "COO", "IT Director", "Founder", "Innovation Lead",
+]
+POSITIONS = ["COO", "CTO", "CEO", "Head of Data", "VP Engineering", "Operations Director", "Founder"]
+LOCATIONS = [
+    "London Tech Hub", "Online", "Manchester Central", "Berlin Expo Center", "Kathmandu Innovation Park",
+    "New York Javits Center", "Sydney Startup Hub", "Online (Zoom)",
+]
+DURATIONS = ["2 hours", "3 hours", "4 hours", "1 Day", "2 Days", "3 Days"]
+TOPICS = [
+    "edge AI", "LLM assistants", "fraud detection", "demand forecasting", "computer vision",
+    "document automation", "MLOps", "data governance", "predictive maintenance", "chatbots",
+    "zero-trust security", "rapid prototyping", "customer analytics", "supply chains",
+]
+FEATURES = [
+    "Multilingual", "Ticket triage", "Live handoff", "Real-time dashboards", "Anomaly alerts",
+    "SSO integration", "Audit logging", "Custom models", "API access", "On-prem deployment",
+    "24/7 support", "Role-based access", "Data export", "Workflow builder", "SLA monitoring",
+]
+METRICS = {
+    "resolution": lambda rng: f"{rng.randint(40, 95)}%",
+    "availability": lambda rng: rng.choice(["24/7", "99.9%", "99.99%"]),
+    "accuracy": lambda rng: f"{rng.randint(85, 99)}%",
+    "time_saved": lambda rng: f"{rng.randint(2, 40)} hrs/week",
+    "roi": lambda rng: f"{rng.randint(120, 400)}%",
+}
+WORDS = (
+    "model data pipeline latency accuracy deploy training inference team customer platform "
+    "insight workflow automation security compliance prototype dashboard signal scale cost "
+    "quality feedback integration cloud edge privacy governance monitoring release"
+).split()
+
+
+def weighted_choice(rng, choices):
+    """Pick a choice value with Zipf-like weights (the first choice is most common)"""
+    values = [value for value, _ in choices]
+    return rng.choices(values, weights=[1 / (rank + 1) for rank in range(len(values))])[0]
+
+
+def sentence(rng, words=12):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+# Article bodies draw whole sentences from a fixed corpus: building every
+# word with its own random call made articles ten times slower than any
+# other model.
+CORPUS = [sentence(random.Random(n), 8 + n % 11) for n in range(1024)]
+
+
+def paragraphs(rng, count):
+    return "\n\n".join(" ".join(rng.choices(CORPUS, k=rng.randint(3, 6))) for _ in range(count))
+
+
+def _person(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def build_inquiry(model, rng, index, anchor):
+    first, last = _person(rng)
+    created = anchor - timedelta(seconds=rng.randint(0, 365 * 86400))
+    return model(
+        full_name=f"{first} {last}",
+        email=f"{first}.{last}{index}@example.com".lower(),
+        phone=f"+44 7{rng.randint(100000000, 999999999)}",
+        company_name=rng.choice(COMPANIES) if rng.random() < 0.8 else "",
+        country=weighted_choice(rng, [(c, c) for c in COUNTRIES]),
+        job_title=weighted_choice(rng, [(t, t) for t in JOB_TITLES]),
+        job_details=sentence(rng, rng.randint(10, 40)),
+        created_at=created,
+    )
+
+
+def build_solution(model, rng, index, anchor):
+    created = anchor - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+    topic = rng.choice(TOPICS)
+    return model(
+        title=f"{topic.title()} Suite {index}",
+        description=sentence(rng, rng.randint(12, 30)),
+        category=weighted_choice(rng, model.CATEGORY_CHOICES),
+        features=rng.sample(FEATURES, rng.randint(3, 6)),
+        metrics={key: METRICS[key](rng) for key in rng.sample(sorted(METRICS), rng.randint(1, 3))},
+        pricing=Decimal(rng.randint(49, 4999)) if rng.random() < 0.7 else None,
+        is_featured=rng.random() < 0.05,
+        is_active=rng.random() < 0.9,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def build_event(model, rng, index, anchor):
+    created = anchor - timedelta(seconds=rng.randint(0, 365 * 86400))
+    topic = rng.choice(TOPICS)
+    event_type = weighted_choice(rng, model.EVENT_TYPE_CHOICES)
+    return model(
+        title=f"{topic.title()} {dict(model.EVENT_TYPE_CHOICES)[event_type]} #{index}",
+        description=sentence(rng, rng.randint(12, 30)),
+        event_type=event_type,
+        date=anchor + timedelta(hours=rng.randint(-180 * 24, 365 * 24)),
+        location=rng.choice(LOCATIONS),
+        duration=rng.choice(DURATIONS),
+        price=rng.choice(["Free", "Free", "£49", "£99", "£299"]),
+        spots_remaining=None if rng.random() < 0.3 else rng.randint(0, 200),
+        is_featured=rng.random() < 0.05,
+        is_active=rng.random() < 0.9,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def build_article(model, rng, index, anchor):
+    published = anchor - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+    topic = rng.choice(TOPICS)
+    body = paragraphs(rng, rng.randint(3, 12))
+    return model(
+        title=f"{sentence(rng, 4)[:-1]} for {topic}",
+        slug=f"synthetic-article-{index}",
+        description=sentence(rng, rng.randint(10, 25)),
+        content=body,
+        category=weighted_choice(rng, model.CATEGORY_CHOICES),
+        read_time=max(1, len(body.split()) // 200),
+        author=rng.choice(["AI-Solutions Team"] * 3 + [" ".join(_person(rng))]),
+        views=int(rng.paretovariate(1.2) * 20),
+        is_featured=rng.random() < 0.05,
+        is_published=rng.random() < 0.9,
+        published_at=published,
+        created_at=published,
+        updated_at=published,
+    )
+
+
+def build_galleryimage(model, rng, index, anchor):
+    created = anchor - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+    category = weighted_choice(rng, model.CATEGORY_CHOICES)
+    label = dict(model.CATEGORY_CHOICES)[category]
+    return model(
+        title=f"{label} {index}",
+        category=category,
+        alt_text=f"{label} photo: {sentence(rng, 5)[:-1].lower()}",
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def build_testimonial(model, rng, index, anchor):
+    created = anchor - timedelta(seconds=rng.randint(0, 2 * 365 * 86400))
+    first, last = _person(rng)
+    return model(
+        name=f"{first} {last}",
+        position=rng.choice(POSITIONS),
+        company=rng.choice(COMPANIES),
+        industry=weighted_choice(rng, model.INDUSTRY_CHOICES),
+        content=sentence(rng, rng.randint(10, 35)),
+        rating=rng.choices([5, 4, 3, 2, 1], weights=[60, 25, 9, 4, 2])[0],
+        avatar_initials=f"{first[0]}{last[0]}",
+        is_featured=rng.random() < 0.05,
+        is_active=rng.random() < 0.9,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def build_pricingplan(model, rng, index, anchor):
+    created = anchor - timedelta(seconds=rng.randint(0, 365 * 86400))
+    return model(
+        name=f"{rng.choice(['Starter', 'Team', 'Business', 'Enterprise', 'Scale'])} {index}",
+        price=rng.choice(["free", "Custom", f"£{rng.randint(1, 9)},{rng.randint(0, 999):03d}", f"£{rng.randint(9, 999)}"]),
+        period=rng.choice(["per month", "per month", "per year"]),
+        description=sentence(rng, rng.randint(5, 12)),
+        features=rng.sample(FEATURES, rng.randint(3, 7)),
+        is_popular=rng.random() < 0.1,
+        is_active=rng.random() < 0.9,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+# model label -> (row builder, rows per unit of --scale)
+GENERATORS = {
+    "main.Inquiry": (build_inquiry, 1.0),
+    "main.Article": (build_article, 1.0),
+    "main.Event": (build_event, 1.0),
+    "main.Solution": (build_solution, 1.0),
+    "main.Testimonial": (build_testimonial, 1.0),
+    "main.GalleryImage": (build_galleryimage, 1.0),
+    # A pricing table with thousands of plans is not a realistic shape.
+    "main.PricingPlan": (build_pricingplan, 0.001),
+}
+
+
+def rows_for(label, scale):
+    return max(1, int(scale * GENERATORS[label][1]))
+
+
+def generate_batch(label, start, count, seed, anchor, using="default"):
+    """Build and insert rows ``start .. start + count`` of ``label``; returns the row count"""
+    from django.apps import apps
+
+    from .db import preserve_timestamps
+
+    model = apps.get_model(label)
+    build = GENERATORS[label][0]
+    rng = random.Random()
+    objs = []
+    for index in range(start, start + count):
+        rng.seed(f"{seed}:{label}:{index}")
+        objs.append(build(model, rng, index, anchor))
+    with preserve_timestamps(model):
+        model._default_manager.using(using).bulk_create(objs, batch_size=1000)
+    return count
+
+
+def init_worker():
+    import django
+
+    django.setup()
@@ -0,0 +1,38 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from ..images import variant_manifest, variant_name
+
+register = template.Library()
+
+
+def _srcset(name, digest, widths, ext):
+    return ", ".join(
+        f"{default_storage.url(variant_name(name, width, ext, digest))} {width}w" for width in widths
+    )
+
+
+@register.simple_tag
+def responsive_image(image, alt="", sizes="100vw", **attrs):
+    """Render ``image`` (an ImageField file) as a WebP/JPEG ``<picture>`` with ``srcset``.
+
+    Until the variants have been generated this is a plain ``<img>`` of the
+    original upload. Extra keyword arguments become ``<img>`` attributes.
+    """
+    if not image:
+        return ""
+    extra = format_html_join("", ' {}="{}"', sorted(attrs.items()))
+    manifest = variant_manifest(image.name)
+    if manifest is None or not manifest["widths"]:
+        return format_html('<img src="{}" alt="{}"{}>', image.url, alt, extra)
+    digest, widths = manifest["digest"], manifest["widths"]
+    largest = default_storage.url(variant_name(image.name, widths[-1], "jpg", digest))
+    return format_html(
+        '<picture class="contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}"{}>'
+        "</picture>",
+        _srcset(image.name, digest, widths, "webp"), sizes,
+        largest, _srcset(image.name, digest, widths, "jpg"), sizes, alt, extra,
+    )
@@ -1,3 +1,934 @@
-from django.test import TestCase
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import F
+from django.template import Context, Template
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import images, search
+from .conditional import fingerprint
+from .counters import BufferedCounter
+from .db import connections_opened, pool_stats
+from .management.commands import bench_routes
+from .ingest import InquiryIngestor
+from .models import (
+    Article, ContentVersion, Event, EventRegistration, GalleryImage, Inquiry, InquiryRollup, Solution,
+    Testimonial,
+)
+from .pagination import decode_cursor, encode_cursor, keyset_ordering, keyset_paginate, keyset_paginate_sequence
+from .registrations import SoldOut, register
+from .resilience import ReadUnavailable, ResilientReader, first_page_key, reader
+from .snapshot import LAYOUT, SnapshotStore, bump_content_version, content_snapshot, content_version, listing_page
+from .stats import content_stats, inquiry_summary, rebuild_content_stats, rebuild_inquiry_rollups
+from .views import article_pages
+
+
+def make_testimonials(count, **fields):
+    """``count`` active testimonials whose ``created_at`` differ only in the microseconds"""
+    Testimonial.objects.bulk_create(
+        Testimonial(
+            name=f"Customer {n}", position="CTO", company="Acme", industry="retail",
+            content="Great", avatar_initials="CU", **fields,
+        )
+        for n in range(count)
+    )
+    # auto_now_add overwrites values given to bulk_create
+    base = timezone.now().replace(microsecond=0)
+    for n, pk in enumerate(Testimonial.objects.order_by("pk").values_list("pk", flat=True)):
+        Testimonial.objects.filter(pk=pk).update(created_at=base + timedelta(microseconds=n * 7))
+
+
+def make_events(count, **fields):
+    base = timezone.now().replace(microsecond=0)
+    Event.objects.bulk_create(
+        Event(
+            title=f"Event {n}", description="d", event_type="webinar",
+            date=base + timedelta(microseconds=(n % 50) * 3), location="Online", duration="1h", **fields,
+        )
+        for n in range(count)
+    )
+
+
+def walk(paginate, **kwargs):
+    """Every row reached by following the cursors from the first page"""
+    seen, after = [], None
+    for _ in range(1000):  # a cursor that repeats rows would never end
+        page = paginate(after=after, **kwargs)
+        seen.extend(row.pk if hasattr(row, "pk") else row["id"] for row in page)
+        if not page.has_next:
+            return seen
+        after = page.next_cursor
+    raise AssertionError(f"Pagination did not end; {len(seen)} rows seen")
+
+
+class KeysetPaginationTests(TestCase):
+    def test_cursor_keeps_microseconds(self):
+        moment = timezone.now().replace(microsecond=123456)
+        ordering = keyset_ordering(Testimonial)
+        values = decode_cursor(encode_cursor([True, moment, 1]), Testimonial, ordering)
+        self.assertEqual(values[1], moment)
+
+    def test_descending_rows_in_one_millisecond_are_each_reached_once(self):
+        make_testimonials(200)
+        queryset = Testimonial.objects.filter(is_active=True)
+        seen = walk(lambda after: keyset_paginate(queryset, after=after, per_page=10))
+        self.assertEqual(len(seen), 200)
+        self.assertEqual(set(seen), set(queryset.values_list("pk", flat=True)))
+
+    def test_ascending_rows_in_one_millisecond_are_each_reached_once(self):
+        make_events(200)
+        queryset = Event.objects.filter(is_active=True)
+        seen = walk(lambda after: keyset_paginate(queryset, after=after, per_page=10))
+        self.assertEqual(len(seen), 200)
+        self.assertEqual(set(seen), set(queryset.values_list("pk", flat=True)))
+
+    def test_sequence_and_queryset_pages_agree(self):
+        make_testimonials(60)
+        queryset = Testimonial.objects.filter(is_active=True)
+        rows = list(queryset.order_by(*keyset_ordering(Testimonial)))
+        from_db = walk(lambda after: keyset_paginate(queryset, after=after, per_page=7))
+        in_memory = walk(lambda after: keyset_paginate_sequence(rows, Testimonial, after=after, per_page=7))
+        self.assertEqual(from_db, in_memory)
+        self.assertEqual(len(in_memory), 60)
+
+    def test_invalid_cursor_returns_first_page(self):
+        make_testimonials(5)
+        queryset = Testimonial.objects.filter(is_active=True)
+        self.assertEqual(
+            [row.pk for row in keyset_paginate(queryset, after="not-a-cursor")],
+            [row.pk for row in keyset_paginate(queryset)],
+        )
+
+
+INQUIRY = {
+    "full_name": "Ada Lovelace", "email": "ada@example.com", "phone": "123", "company_name": "",
+    "country": "UK", "job_title": "", "job_details": "Engines",
+}
+
+
+@override_settings(INQUIRY_MAX_ATTEMPTS=2)
+class InquiryIngestTests(TestCase):
+    def setUp(self):
+        spill_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spill_dir.cleanup)
+        # No background thread: the test drives _write itself.
+        patcher = mock.patch.object(InquiryIngestor, "_run", lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ingestor = InquiryIngestor(spill_dir=spill_dir.name)
+
+    def test_bad_payload_does_not_block_the_batch_and_is_quarantined(self):
+        for payload in (INQUIRY, {**INQUIRY, "unknown_field": 1}, {**INQUIRY, "full_name": "Grace"}):
+            self.assertTrue(self.ingestor.submit(payload))
+        seqs = sorted(self.ingestor._pending)
+
+        self.assertFalse(self.ingestor._write(seqs))
+        self.assertEqual(set(Inquiry.objects.values_list("full_name", flat=True)), {"Ada Lovelace", "Grace"})
+        self.assertEqual(self.ingestor.pending_count(), 1)
+
+        self.assertTrue(self.ingestor._write(seqs))
+        self.assertEqual(self.ingestor.pending_count(), 0)
+        self.assertEqual(Inquiry.objects.count(), 2)
+        with open(self.ingestor.failed_path, encoding="utf-8") as failed:
+            [entry] = [json.loads(line) for line in failed]
+        self.assertEqual(entry["data"]["unknown_field"], 1)
+        self.assertEqual(self.ingestor.journal_path.read_text(), "")
+
+    def test_unwritable_spill_dir_falls_back_to_sync_save(self):
+        ingestor = InquiryIngestor(spill_dir="/proc/no-such-dir")
+        self.assertFalse(ingestor.submit(INQUIRY))
+
+
+class StreamLoaddataTests(TestCase):
+    def test_many_to_many_values_are_loaded(self):
+        permissions = list(Permission.objects.order_by("pk").values_list("pk", flat=True)[:3])
+        fixture = [
+            {"model": "auth.group", "pk": 900, "fields": {"name": "editors", "permissions": permissions}},
+            {"model": "main.inquiry", "pk": 900, "fields": {
+                **INQUIRY, "created_at": "2026-01-02T03:04:05.678901Z",
+            }},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as path:
+            json.dump(fixture, path)
+            path.flush()
+            call_command("stream_loaddata", path.name, stdout=mock.MagicMock())
+
+        group = Group.objects.get(pk=900)
+        self.assertEqual(sorted(group.permissions.values_list("pk", flat=True)), permissions)
+        self.assertEqual(Inquiry.objects.get(pk=900).created_at.microsecond, 678901)
+
+
+def load_fixture(records):
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as path:
+        json.dump(records, path)
+        path.flush()
+        call_command("loaddata", path.name, verbosity=0)
+
+
+def testimonial_record(pk, industry, rating, **fields):
+    return {"model": "main.testimonial", "pk": pk, "fields": {
+        "name": f"Customer {pk}", "position": "CTO", "company": "Acme", "industry": industry,
+        "content": "Great", "rating": rating, "avatar_initials": "CU",
+        "created_at": "2026-01-02T03:04:05Z", "updated_at": "2026-01-02T03:04:05Z", **fields,
+    }}
+
+
+class ContentStatTests(TestCase):
+    FIXTURE = [
+        testimonial_record(1, "retail", 5),
+        testimonial_record(2, "retail", 4),
+        testimonial_record(3, "education", 3, is_active=False),
+        {"model": "main.article", "pk": 1, "fields": {
+            "title": "A", "slug": "a", "description": "d", "category": "ai", "read_time": 3,
+            "published_at": "2026-01-02T03:04:05Z", "created_at": "2026-01-02T03:04:05Z",
+            "updated_at": "2026-01-02T03:04:05Z",
+        }},
+    ]
+
+    def stats(self):
+        return {model: content_stats(model) for model in (Article, Event, Testimonial)}
+
+    def assertMatchesRebuild(self):
+        counted = self.stats()
+        rebuild_content_stats()
+        self.assertEqual(counted, self.stats())
+        return counted
+
+    def test_loaddata_counts_the_fixture_rows(self):
+        load_fixture(self.FIXTURE)
+        counted = self.assertMatchesRebuild()
+        self.assertEqual(counted[Testimonial], {"retail": {"count": 2, "avg_rating": 4.5}})
+        self.assertEqual(counted[Article], {"ai": 1})
+
+    def test_reloading_a_fixture_moves_rows_between_buckets(self):
+        load_fixture(self.FIXTURE)
+        load_fixture([testimonial_record(2, "education", 4), testimonial_record(3, "education", 3)])
+        counted = self.assertMatchesRebuild()
+        self.assertEqual(counted[Testimonial], {
+            "retail": {"count": 1, "avg_rating": 5.0},
+            "education": {"count": 2, "avg_rating": 3.5},
+        })
+
+    def test_badges_follow_the_choice_order_in_one_query(self):
+        load_fixture([
+            testimonial_record(1, "logistics", 5),
+            testimonial_record(2, "healthcare", 4),
+            testimonial_record(3, "healthcare", 3),
+        ])
+        with self.assertNumQueries(1):
+            stats = content_stats(Testimonial)
+        self.assertEqual(list(stats.items()), [
+            ("healthcare", {"count": 2, "avg_rating": 3.5}),
+            ("logistics", {"count": 1, "avg_rating": 5.0}),
+        ])
+
+
+class InquiryRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def rollups(self):
+        return sorted(InquiryRollup.objects.filter(count__gt=0).values_list("day", "dimension", "value", "count"))
+
+    def assertMatchesRebuild(self):
+        counted = self.rollups()
+        rebuild_inquiry_rollups()
+        self.assertEqual(counted, self.rollups())
+
+    def test_dashboard_counts_a_loaded_fixture(self):
+        created_at = timezone.now().isoformat()
+        load_fixture([
+            {"model": "main.inquiry", "pk": pk, "fields": {**INQUIRY, "created_at": created_at}}
+            for pk in (1, 2, 3)
+        ])
+        self.assertMatchesRebuild()
+        self.client.force_login(User.objects.create_user("staff"))
+        response = self.client.get(reverse("admin_dashboard"))
+        self.assertEqual(response.context["total_inquiries"], 3)
+        self.assertEqual(response.context["summary"]["today_count"], 3)
+        self.assertEqual(response.context["summary"]["top_country"], [{"value": "UK", "total": 3}])
+
+    def test_edits_and_deletes_move_the_rollup_rows(self):
+        inquiry = Inquiry.objects.create(**INQUIRY)
+        Inquiry.objects.create(**{**INQUIRY, "country": "France"})
+        inquiry.country = "Spain"
+        inquiry.created_at -= timedelta(days=3)
+        inquiry.save()
+        self.assertMatchesRebuild()
+        inquiry.delete()
+        self.assertMatchesRebuild()
+        summary = inquiry_summary()
+        self.assertEqual((summary["total"], summary["today_count"]), (1, 1))
+        self.assertEqual(summary["top_country"], [{"value": "France", "total": 1}])
+
+
+def make_article(**fields):
+    return Article.objects.create(**{
+        "title": "Shipping models", "slug": "shipping-models", "description": "d", "category": "ai",
+        "read_time": 4, **fields,
+    })
+
+
+class BufferedCounterTests(TestCase):
+    def setUp(self):
+        self.article = make_article()
+        # No flusher thread: the tests decide when counts are written.
+        patcher = mock.patch.object(BufferedCounter, "_ensure_thread")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def views(self):
+        return Article.objects.get(pk=self.article.pk).views
+
+    def test_flushes_when_max_pending_is_reached(self):
+        counter = BufferedCounter("main.Article", "views", max_pending=3)
+        counter.increment(self.article.pk)
+        counter.increment(self.article.pk)
+        self.assertEqual((self.views(), counter.pending(self.article.pk)), (0, 2))
+        counter.increment(self.article.pk)
+        self.assertEqual((self.views(), counter.pending(self.article.pk)), (3, 0))
+
+    def test_flushes_at_exit(self):
+        with mock.patch("atexit.register") as register:
+            counter = BufferedCounter("main.Article", "views", max_pending=100)
+        counter.increment(self.article.pk, 5)
+        [(flush,), _] = register.call_args
+        flush()
+        self.assertEqual((self.views(), counter.pending(self.article.pk)), (5, 0))
+
+    def test_failed_flush_keeps_the_counts(self):
+        counter = BufferedCounter("main.Article", "views", max_pending=100)
+        counter.increment(self.article.pk, 2)
+        with mock.patch("django.db.models.query.QuerySet.update", side_effect=OperationalError("locked")):
+            self.assertEqual(counter.flush(), 0)
+        self.assertEqual(counter.pending(self.article.pk), 2)
+        self.assertEqual(counter.flush(), 1)
+        self.assertEqual(self.views(), 2)
+
+
+class ConcurrentCounterTests(TransactionTestCase):
+    def test_concurrent_increments_are_not_lost(self):
+        article = make_article()
+        counter = BufferedCounter("main.Article", "views", max_pending=7)
+
+        def hit():
+            try:
+                for _ in range(250):
+                    counter.increment(article.pk)
+            finally:
+                connection.close()
+
+        with mock.patch.object(BufferedCounter, "_ensure_thread"):
+            threads = [threading.Thread(target=hit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        counter.flush()
+        article.refresh_from_db()
+        self.assertEqual(article.views, 2000)
+
+
+class GenerateContentTests(TestCase):
+    def generate(self, *args):
+        call_command(
+            "generate_content", "--scale", "20", "--model", "main.Event", "--model", "main.Testimonial", *args,
+            stdout=io.StringIO(),
+        )
+
+    def test_clear_regenerates_the_same_rows(self):
+        self.generate()
+        register(Event.objects.order_by("pk").first(), "Ada", "ada@example.com", "key")
+        events = sorted(Event.objects.values_list("title", "date"))
+        self.generate("--clear")
+        self.assertEqual(sorted(Event.objects.values_list("title", "date")), events)
+        self.assertEqual(Testimonial.objects.count(), 20)
+        self.assertFalse(EventRegistration.objects.exists())
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        search.reset_availability()
+        self.addCleanup(search.reset_availability)
+        if not search.is_available():
+            self.skipTest("no full-text index on this database")
+        self.article = make_article(title="Kubernetes autoscaling", content="Horizontal pod autoscalers")
+        self.event = Event.objects.create(
+            title="Quantum workshop", description="d", event_type="workshop", date=timezone.now(),
+            location="Online", duration="1h",
+        )
+
+    def test_words_match_as_prefixes(self):
+        self.assertEqual(search.search("autosc kube"), [("article", self.article.pk)])
+        self.assertEqual(search.search("quant"), [("event", self.event.pk)])
+        self.assertContains(self.client.get(reverse("search"), {"q": "quant"}), "Quantum workshop")
+
+    def test_index_follows_saves_and_deletes(self):
+        self.article.title = "Serverless autoscaling"
+        self.article.save()
+        self.assertEqual(search.search("serverless"), [("article", self.article.pk)])
+        self.assertEqual(search.search("kubernetes"), [])
+
+        self.article.is_published = False
+        self.article.save()
+        self.assertEqual(search.search("serverless"), [])
+        self.assertEqual(search.search("serverless", visible_only=False), [("article", self.article.pk)])
+
+        self.article.delete()
+        self.assertEqual(search.search("serverless", visible_only=False), [])
+
+    def test_admin_search_uses_the_index(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        make_article(title="Edge inference", slug="edge-inference")
+        # Only the stemmed index matches "autoscaled" to "autoscaling"; icontains would find nothing.
+        response = self.client.get(reverse("admin:main_article_changelist"), {"q": "autoscaled kubernetes"})
+        self.assertEqual([article.pk for article in response.context["cl"].result_list], [self.article.pk])
+
+
+class InquiryExportTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("staff"))
+
+    def export(self, fmt):
+        response = self.client.get(reverse("export_inquiries"), {"format": fmt})
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_cells_are_not_formulas(self):
+        Inquiry.objects.create(**{
+            **INQUIRY, "full_name": '=HYPERLINK("http://evil.example","x")', "company_name": "@SUM(A1)",
+            "phone": "+44 191", "job_title": "-1", "country": "\tUK", "job_details": "plain",
+        })
+        body = self.export("csv")
+        self.assertIn('"\'=HYPERLINK(""http://evil.example"",""x"")"', body)
+        for cell in ("'@SUM(A1)", "'+44 191", "'-1", "'\tUK", ",plain,"):
+            self.assertIn(cell, body)
+
+    def test_ndjson_keeps_values_as_entered(self):
+        Inquiry.objects.create(**{**INQUIRY, "full_name": "=1+1"})
+        self.assertEqual(json.loads(self.export("ndjson"))["full_name"], "=1+1")
+
+    def test_unknown_format_is_not_reflected_as_html(self):
+        response = self.client.get(reverse("export_inquiries"), {"format": "<script>alert(1)</script>"})
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+
+def png(color, size=(800, 400)):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.path = os.path.join(media.name, "gallery", "photo.png")
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            f.write(png("red"))
+        images._manifests.clear()
+        self.addCleanup(images._manifests.clear)
+
+    def render(self):
+        return Template('{% load responsive_images %}{% responsive_image image %}').render(
+            Context({"image": GalleryImage(image="gallery/photo.png").image})
+        )
+
+    def test_rendering_reads_the_manifest_without_hashing(self):
+        self.assertNotIn("srcset", self.render())
+        images.generate_variants("gallery/photo.png")
+        images._manifests.clear()
+        with mock.patch("main.images._hash_file", side_effect=AssertionError("hashed at render")):
+            html = self.render()
+        digest = images.variant_manifest("gallery/photo.png")["digest"]
+        for width in (320, 640):
+            self.assertIn(images.variant_name("gallery/photo.png", width, "webp", digest), html)
+
+    def test_replaced_upload_gets_new_variant_names(self):
+        images.generate_variants("gallery/photo.png")
+        before = images.variant_manifest("gallery/photo.png")
+        self.assertEqual(before["widths"], [320, 640])
+
+        with open(self.path, "wb") as f:
+            f.write(png("blue", size=(800, 401)))
+        # Past the recheck interval, the new size is noticed and the original served until regenerated.
+        with mock.patch("main.images.time.monotonic", return_value=10 ** 9):
+            self.assertIsNone(images.variant_manifest("gallery/photo.png"))
+        images.generate_variants("gallery/photo.png")
+        images._manifests.clear()
+        self.assertNotEqual(images.variant_manifest("gallery/photo.png")["digest"], before["digest"])
+
+
+class PrerenderedFallbackTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        override = override_settings(PRERENDER_ROOT=root.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        os.makedirs(os.path.join(root.name, "portfolio"))
+        with open(os.path.join(root.name, "portfolio", "index.html"), "wb") as f:
+            f.write(b"<h1>Prerendered portfolio</h1>")
+
+    def test_failing_view_serves_the_prerendered_copy(self):
+        with mock.patch("main.views.render", side_effect=RuntimeError("template broke")):
+            response = self.client.get(reverse("portfolio"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<h1>Prerendered portfolio</h1>")
+
+    def test_missing_copy_keeps_the_old_fallback(self):
+        with mock.patch("main.views.render", side_effect=RuntimeError("template broke")):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "Site is working")
+
+
+BENCH_RESULT = {"path": "/solutions/", "requests": 200, "errors": 0, "p50_ms": 8.0, "p95_ms": 10.0,
+                "p99_ms": 14.0, "throughput_rps": 400.0, "queries_per_request": 3.0}
+
+
+class BenchRoutesTests(TestCase):
+    def compare(self, baseline=BENCH_RESULT, **changes):
+        command = bench_routes.Command(stdout=io.StringIO(), stderr=io.StringIO())
+        command.options = {"tolerance": 0.25, "min_delta_ms": 2.0, "baseline": "baseline.json"}
+        try:
+            command.compare({"solutions": {**baseline, **changes}}, {"solutions": baseline})
+        except CommandError:
+            return command.stderr.getvalue()
+        return None
+
+    def test_run_writes_a_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            call_command(
+                "bench_routes", route=["portfolio"], requests=4, concurrency=2, warmup=0,
+                save_baseline=baseline, stdout=io.StringIO(),
+            )
+            with open(baseline) as f:
+                [(name, result)] = json.load(f).items()
+        self.assertEqual(name, "portfolio")
+        self.assertEqual((result["requests"], result["errors"]), (4, 0))
+        self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+        self.assertIsNotNone(result["queries_per_request"])
+
+    def test_slowdowns_within_tolerance_pass(self):
+        self.assertIsNone(self.compare(p95_ms=12.5))
+        # Below the 2 ms floor, timer noise on a fast route is not a regression.
+        self.assertIsNone(self.compare(baseline={**BENCH_RESULT, "p95_ms": 1.0}, p95_ms=2.9))
+
+    def test_regressions_fail(self):
+        for changes, message in (
+            ({"p95_ms": 12.6}, "solutions: p95 10.0 -> 12.6 ms"),
+            ({"queries_per_request": 3.5}, "solutions: queries/request 3.0 -> 3.5"),
+            ({"errors": 1}, "solutions: errors 0 -> 1"),
+        ):
+            with self.subTest(message):
+                self.assertIn(message, self.compare(**changes) or "")
+
+
+@override_settings(PERF_SAMPLE_RATE=1)
+class ServerTimingTests(TestCase):
+    def test_header_only_when_enabled(self):
+        with override_settings(PERF_SERVER_TIMING=False):
+            self.assertNotIn("Server-Timing", self.client.get(reverse("portfolio")))
+        with override_settings(PERF_SERVER_TIMING=True):
+            self.assertIn("queries", self.client.get(reverse("portfolio"))["Server-Timing"])
+
+
+class SnapshotDirectoryTests(TestCase):
+    def setUp(self):
+        parent = tempfile.TemporaryDirectory()
+        self.addCleanup(parent.cleanup)
+        self.directory = os.path.join(parent.name, "snapshot")
+        override = override_settings(CONTENT_SNAPSHOT_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        make_testimonials(3)
+        self.version = content_version()
+
+    def load(self):
+        return SnapshotStore()._load(self.version)
+
+    def test_directory_is_created_private_and_shared(self):
+        tables = self.load()
+        self.assertEqual(len(tables["main.Testimonial"][0]), 3)
+        self.assertEqual(os.stat(self.directory).st_mode & 0o777, 0o700)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, f"content-{self.version}-{LAYOUT}.pickle")))
+
+    def test_writable_directory_is_not_used(self):
+        os.makedirs(self.directory)
+        os.chmod(self.directory, 0o777)
+        self.assertEqual(len(self.load()["main.Testimonial"][0]), 3)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_planted_file_is_not_unpickled(self):
+        os.makedirs(self.directory, mode=0o700)
+        path = os.path.join(self.directory, f"content-{self.version}-{LAYOUT}.pickle")
+        with open(path, "wb") as f:
+            f.write(b"not a pickle")
+        os.chmod(path, 0o666)
+        self.assertEqual(len(self.load()["main.Testimonial"][0]), 3)
+
+    def test_rolled_back_version_is_not_reused(self):
+        with transaction.atomic():
+            bump_content_version()
+            rolled_back = content_version()
+            transaction.set_rollback(True)
+        bump_content_version()
+        self.assertNotEqual(content_version(), rolled_back)
+
+
+class ApiPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def walk_api(self, url):
+        seen = []
+        for _ in range(100):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen.extend(row["id"] for row in body["results"])
+            if body["next"] is None:
+                return seen
+            url = body["next"]
+        raise AssertionError(f"Pagination did not end; {len(seen)} rows seen")
+
+    def test_rows_with_colliding_timestamps_are_each_listed_once(self):
+        make_testimonials(45)
+        make_events(45)
+        for url, model in (
+            ("/api/testimonials/?fields=id,name&limit=10", Testimonial),
+            ("/api/events/?fields=id,title&limit=10", Event),
+        ):
+            with self.subTest(url):
+                seen = self.walk_api(url)
+                self.assertEqual(len(seen), 45)
+                self.assertEqual(set(seen), set(model.objects.values_list("pk", flat=True)))
+
+
+@override_settings(CONTENT_SNAPSHOT=False)
+class PageCacheTests(TestCase):
+    url = "/api/testimonials/?fields=id,name"
+
+    def setUp(self):
+        cache.clear()
+        make_testimonials(2)
+
+    def count(self, url):
+        return len(self.client.get(url).json()["results"])
+
+    def test_content_version_bump_from_another_worker_retires_the_page(self):
+        self.assertEqual(self.count(self.url), 2)
+        # bulk_create sends no signals, so this process's generations stay put.
+        make_testimonials(1)
+        self.assertEqual(self.count(self.url), 2)
+        ContentVersion.objects.update(version=F("version") + 1)
+        self.assertEqual(self.count(self.url), 3)
+
+    def test_only_the_parameters_the_view_reads_are_part_of_the_key(self):
+        self.assertEqual(self.count(self.url), 2)
+        make_testimonials(1)
+        self.assertEqual(self.count(f"{self.url}&utm_source=mail"), 2)
+        self.assertEqual(self.count(f"{self.url}&limit=50"), 3)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_testimonials(2)
+
+    def test_unchanged_listing_answers_304_until_a_row_changes(self):
+        response = self.client.get(reverse("testimonials"))
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(reverse("testimonials"), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(
+            self.client.get(reverse("testimonials"), HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code,
+            304,
+        )
+
+        Testimonial.objects.order_by("pk").first().delete()
+        response = self.client.get(reverse("testimonials"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(CONTENT_SNAPSHOT=False, LISTING_PAGE_SIZE=10)
+class ListingIndexTests(TestCase):
+    def plans(self, queryset):
+        """SQLite query plan of every query a listing page, its next page and its ETag run"""
+        with CaptureQueriesContext(connection) as captured:
+            page = listing_page(queryset)
+            listing_page(queryset, after=page.next_cursor)
+            fingerprint(queryset)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in captured.captured_queries:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plans.append(" ".join(row[-1] for row in cursor.fetchall()))
+        return plans
+
+    def test_listing_queries_use_their_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("reads SQLite query plans")
+        make_events(30)
+        make_testimonials(30)
+        for queryset, order_index, updated_index in (
+            (Event.objects.filter(is_active=True), "event_active_date_idx", "event_active_updated_idx"),
+            (Testimonial.objects.filter(is_active=True), "testimonial_active_order_idx", "testimonial_active_updated_idx"),
+        ):
+            with self.subTest(queryset.model.__name__):
+                first, second, validator = self.plans(queryset)
+                for plan in (first, second):
+                    self.assertIn(f"INDEX {order_index}", plan)
+                    self.assertNotIn("TEMP B-TREE", plan)
+                self.assertIn(f"COVERING INDEX {updated_index}", validator)
+
+
+class ArticleDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        article_pages.clear()
+        self.article = make_article()
+        self.url = reverse("article_detail", args=[self.article.slug])
+
+    def test_listing_links_to_the_detail_page(self):
+        self.assertContains(self.client.get(reverse("articles")), f'href="{self.url}"')
+        self.assertContains(self.client.get(self.url), "Shipping models")
+
+    def test_unpublishing_through_another_worker_retires_the_cached_page(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        # What another worker's save leaves behind: no signal here, only the shared version moves.
+        Article.objects.filter(pk=self.article.pk).update(is_published=False)
+        ContentVersion.objects.update(version=F("version") + 1)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+@override_settings(READ_BUDGET_SECONDS=2, READ_RETRY_SECONDS=60)
+class ResilientReadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.reader = ResilientReader(size=64)
+
+    def test_reads_see_the_request_transaction(self):
+        Solution.objects.create(title="Claims triage", description="d", category="automation")
+        self.assertContains(self.client.get(reverse("solutions")), "Claims triage")
+
+    def test_database_error_serves_the_last_good_value(self):
+        self.assertEqual(self.reader.read("plans", lambda: ["basic"]), ["basic"])
+
+        def failing():
+            raise OperationalError("server closed the connection")
+
+        self.assertEqual(self.reader.read("plans", failing), ["basic"])
+        self.assertIsNotNone(self.reader._failed_at.get("plans"))
+        with self.assertRaises(ReadUnavailable):
+            self.reader.read("solutions", failing)
+
+    def test_other_exceptions_are_not_failures(self):
+        def missing():
+            raise KeyError("slug")
+
+        with self.assertRaises(KeyError):
+            self.reader.read("article", missing)
+        self.assertIsNone(self.reader._failed_at.get("article"))
+
+    def test_cursor_pages_keep_no_fallback(self):
+        self.reader.read(first_page_key("events", None), lambda: ["first"])
+        for n in range(100):
+            self.reader.read(first_page_key("events", f"cursor-{n}"), lambda: ["later"])
+        self.assertEqual(len(self.reader._values), 1)
+
+
+@override_settings(READ_BUDGET_SECONDS=0.2)
+class StatementBudgetTests(TransactionTestCase):
+    SLOW_QUERY = (
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+        "SELECT count(*) FROM n"
+    )
+
+    def slow_query(self):
+        with connection.cursor() as cursor:
+            cursor.execute(self.SLOW_QUERY)
+            return cursor.fetchone()[0]
+
+    def test_slow_query_is_cancelled_and_the_stale_copy_served(self):
+        reader = ResilientReader(size=8)
+        reader.read("count", lambda: 1)
+        started = time.monotonic()
+        self.assertEqual(reader.read("count", self.slow_query), 1)
+        self.assertLess(time.monotonic() - started, 2)
+        # The connection is still usable.
+        self.assertEqual(reader.read("events", lambda: Event.objects.count()), 0)
+
+
+@override_settings(SEAT_REFRESH_SECONDS=0)
+class ConcurrentRegistrationTests(TransactionTestCase):
+    def make_event(self, seats):
+        return Event.objects.create(
+            title="Masterclass", description="d", event_type="masterclass", date=timezone.now(),
+            location="Online", duration="1h", spots_remaining=seats,
+        )
+
+    def register_together(self, attempts):
+        """Run ``register(event, key)`` for every ``(event, key)`` at once; the outcomes, in order"""
+        barrier = threading.Barrier(len(attempts))
+        outcomes = [None] * len(attempts)
+
+        def worker(index, event, key):
+            try:
+                barrier.wait()
+                registration, created = register(event, "Ada", "ada@example.com", key)
+                outcomes[index] = (registration.pk, created)
+            except SoldOut:
+                outcomes[index] = "sold out"
+            except Exception as e:
+                outcomes[index] = e
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(index, *attempt)) for index, attempt in enumerate(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_never_oversold(self):
+        event = self.make_event(seats=5)
+        outcomes = self.register_together([(event, f"key-{n}") for n in range(20)])
+
+        self.assertEqual([outcome for outcome in outcomes if isinstance(outcome, Exception)], [])
+        self.assertEqual(sum(1 for outcome in outcomes if outcome != "sold out"), 5)
+        event.refresh_from_db()
+        self.assertEqual(event.spots_remaining, 0)
+        self.assertEqual(event.registrations.filter(status="registered").count(), 5)
+
+    def test_replayed_key_takes_one_seat(self):
+        event = self.make_event(seats=5)
+        outcomes = self.register_together([(event, "same-key")] * 6)
+
+        self.assertEqual([outcome for outcome in outcomes if isinstance(outcome, Exception)], [])
+        self.assertEqual(len({pk for pk, _ in outcomes}), 1)
+        self.assertEqual(sum(1 for _, created in outcomes if created), 1)
+        event.refresh_from_db()
+        self.assertEqual(event.spots_remaining, 4)
+
+    def test_key_is_scoped_to_its_event(self):
+        first, second = self.make_event(seats=5), self.make_event(seats=5)
+        one, created_one = register(first, "Ada", "ada@example.com", "shared-key")
+        two, created_two = register(second, "Ada", "ada@example.com", "shared-key")
+
+        self.assertTrue(created_one and created_two)
+        self.assertNotEqual(one.pk, two.pk)
+        self.assertEqual(EventRegistration.objects.get(pk=two.pk).event_id, second.pk)
+        self.assertEqual(register(second, "Ada", "ada@example.com", "shared-key"), (two, False))
+
+
+# The async reads run on worker threads with their own connections, so the
+# rows must be committed.
+@override_settings(ROOT_URLCONF="config.urls_async")
+class ConnectionReuseTests(TransactionTestCase):
+    def test_request_cycles_reuse_one_connection_per_thread(self):
+        out = io.StringIO()
+        with mock.patch.dict(connection.settings_dict, {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True}):
+            opened = connections_opened()
+            call_command("check_db_pool", "--requests", "20", "--threads", "2", "--compare", stdout=out)
+            stats = pool_stats()
+        self.assertIn("configured: 20 requests, 2 connections opened", out.getvalue())
+        self.assertIn("no reuse: 20 requests, 20 connections opened", out.getvalue())
+        self.assertEqual(stats["opened"], opened + 22)
+        self.assertEqual((stats["conn_max_age"], stats["health_checks"]), (600, True))
+
+
+class AsyncListingTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        # A fallback kept by an earlier test would hide the failed read.
+        reader.clear()
+
+    async def test_async_page_matches_the_sync_one(self):
+        await Solution.objects.acreate(title="Claims triage", description="d", category="automation", is_featured=True)
+        async_response = await self.async_client.get("/solutions/")
+        with override_settings(ROOT_URLCONF="config.urls"):
+            cache.clear()
+            sync_response = await sync_to_async(self.client.get)("/solutions/")
+        self.assertContains(async_response, "Claims triage")
+        self.assertEqual(async_response.content, sync_response.content)
+
+    async def test_failed_read_uses_the_sync_fallback(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        os.makedirs(os.path.join(root.name, "testimonials"))
+        with open(os.path.join(root.name, "testimonials", "index.html"), "wb") as f:
+            f.write(b"<h1>Prerendered testimonials</h1>")
+        with override_settings(PRERENDER_ROOT=root.name), \
+                mock.patch("main.views.listing_page", side_effect=OperationalError("down")):
+            response = await self.async_client.get("/testimonials/")
+        self.assertEqual(response.content, b"<h1>Prerendered testimonials</h1>")
+
+
+@override_settings(LISTING_PAGE_SIZE=10)
+class FeaturedRowsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        make_events(25)
+        Event.objects.filter(title="Event 24").update(title="Launch keynote", is_featured=True)
+        # update() skips the signals, so build this test's snapshot from scratch.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        override = override_settings(CONTENT_SNAPSHOT_DIR=directory.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        content_snapshot.clear()
+        self.addCleanup(content_snapshot.clear)
+
+    def test_featured_row_beyond_the_first_page_is_shown_on_every_page(self):
+        for snapshot in (True, False):
+            with self.subTest(snapshot=snapshot), override_settings(CONTENT_SNAPSHOT=snapshot):
+                cache.clear()
+                first = self.client.get(reverse("events"))
+                self.assertEqual([event.title for event in first.context["featured_events"]], ["Launch keynote"])
+                self.assertNotIn("Launch keynote", [event.title for event in first.context["events"]])
+                second = self.client.get(reverse("events"), {"after": first.context["page"].next_cursor})
+                self.assertEqual(
+                    [event.title for event in second.context["featured_events"]], ["Launch keynote"],
+                )
+
+
+class WsgiStartupTests(TestCase):
+    def test_startup_error_is_served_by_the_fallback_app(self):
+        for module in ("config.wsgi", "config.wsgi_public"):
+            with (
+                self.subTest(module),
+                mock.patch.dict(os.environ),
+                mock.patch("django.core.wsgi.get_wsgi_application", side_effect=RuntimeError("no settings")),
+            ):
+                sys.modules.pop(module, None)
+                self.addCleanup(sys.modules.pop, module, None)
+                start_response = mock.Mock()
+                body = importlib.import_module(module).application({}, start_response)
+                self.assertEqual(body, [b"Django WSGI Error: no settings"])
+                self.assertEqual(start_response.call_args.args[0], "500 Internal Server Error")
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 from django.http import HttpResponse
 
 def test_view(request):
@@ -12,8 +12,16 @@ urlpatterns = [
     path("portfolio/", views.portfolio, name="portfolio"),
     path("testimonials/", views.testimonials, name="testimonials"),
     path("articles/", views.articles, name="articles"),
+    path("articles/<slug:slug>/", views.article_detail, name="article_detail"),
     path("gallery/", views.gallery, name="gallery"),
     path("events/", views.events, name="events"),
+    path("events/<int:pk>/register/", views.register_event, name="register_event"),
+    path("search/", views.search, name="search"),
     path("contact/", views.contact, name="contact"),
     path("dashboard/", views.admin_dashboard, name="admin_dashboard"),
+    path("dashboard/export/", views.export_inquiries, name="export_inquiries"),
+    path("api/", api.api_index, name="api_index"),
+] + [
+    path(f"api/{name}/", api.resource_view(name), name=f"api_{name.replace('-', '_')}")
+    for name in api.RESOURCES
 ] 
\ No newline at end of file
@@ -1,183 +1,254 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
+from django.http import HttpResponse
 from django.urls import reverse
 from django.contrib import messages
-from django.db import models, connection
+from django.db import connection
 from django.core.exceptions import ImproperlyConfigured
 import logging
+import os
+from dataclasses import dataclass, field
+from functools import partial
 
-from .forms import ContactForm
+from .cache import (
+    LocalLRUCache, cache_public_page, has_pending_messages, skip_page_cache,
+)
+from .counters import article_views
+from .conditional import listing_condition
+from .exports import CONTENT_TYPES, export_response, filter_inquiries
+from .forms import ContactForm, EventRegistrationForm
+from .ingest import save_inquiry
+from .pagination import KeysetPage
+from .registrations import SoldOut, register
+from .resilience import first_page_key, read
+from .search import search_objects
+from .snapshot import content_version, listing_featured, listing_page, listing_rows, listing_stats
 from .models import (
     Inquiry, Solution, Event, Article, GalleryImage, 
     Testimonial, PricingPlan
 )
+from .stats import inquiry_summary
 
 logger = logging.getLogger(__name__)
 
+# slug -> (article pk, ContentVersion it was rendered at, rendered HTML)
+article_pages = LocalLRUCache(settings.ARTICLE_PAGE_CACHE_SIZE)
+
+
+def prerendered_page(request):
+    """The build-time copy of a PRERENDERED_PAGES view, or None; served when rendering fails"""
+    match = request.resolver_match
+    if match is None or match.url_name not in settings.PRERENDERED_PAGES:
+        return None
+    path = os.path.join(settings.PRERENDER_ROOT, reverse(match.url_name).strip("/"), "index.html")
+    try:
+        with open(path, "rb") as f:
+            return HttpResponse(f.read())
+    except OSError:
+        return None
+
+
+@dataclass(frozen=True)
+class Listing:
+    """A paginated public listing; sync and async views both render it through this"""
+    name: str  # URL name, and by default the context name of the page's rows
+    template: str
+    model: type
+    visible: dict
+    # (context name, read key, fetch, fallback value) read besides the page
+    extras: tuple = ()
+    featured: bool = True
+    static_context: dict = field(default_factory=dict)
+    defer: tuple = ()
+    rows_name: str = ""
+
+    def queryset(self):
+        return self.model._default_manager.filter(**self.visible).defer(*self.defer)
+
+    def reads(self, request):
+        """``{context name: callable}`` of the page's independent reads"""
+        after = request.GET.get('after')
+        reads = {'page': partial(
+            read, first_page_key(self.name, after), partial(listing_page, self.queryset(), after=after), request,
+        )}
+        if self.featured:
+            reads[f'featured_{self.name}'] = partial(
+                read, f'featured_{self.name}', partial(listing_featured, self.queryset()), request,
+            )
+        for context_name, key, fetch, _ in self.extras:
+            reads[context_name] = partial(read, key, fetch, request)
+        return reads
+
+    def context(self, results):
+        return {**self.static_context, **results, self.rows_name or self.name: list(results['page'])}
+
+    def fallback_context(self):
+        context = {**self.static_context, self.rows_name or self.name: [], 'page': KeysetPage([])}
+        if self.featured:
+            context[f'featured_{self.name}'] = []
+        for context_name, _, _, value in self.extras:
+            context[context_name] = value
+        return context
+
+
+SOLUTIONS = Listing('solutions', 'main/solutions.html', Solution, {'is_active': True}, extras=(
+    ('pricing_plans', 'pricing_plans', lambda: list(listing_rows(PricingPlan.objects.filter(is_active=True))), []),
+))
+TESTIMONIALS = Listing('testimonials', 'main/testimonials.html', Testimonial, {'is_active': True}, extras=(
+    ('industry_stats', 'testimonial_stats', partial(listing_stats, Testimonial), {}),
+))
+# The listing never shows the body, so leave the large content column behind
+ARTICLES = Listing('articles', 'main/articles.html', Article, {'is_published': True}, defer=('content',), extras=(
+    ('category_stats', 'article_stats', partial(listing_stats, Article), {}),
+))
+EVENTS = Listing('events', 'main/events.html', Event, {'is_active': True}, extras=(
+    ('event_type_stats', 'event_stats', partial(listing_stats, Event), {}),
+))
+# GalleryImage has no is_active/is_featured flags; every image is public
+GALLERY = Listing('gallery', 'main/gallery.html', GalleryImage, {}, featured=False, rows_name='images', static_context={
+    'title': 'Photo Gallery',
+    'subtitle': 'Promotional events and moments.',
+    'icon_class': 'ri-gallery-line',
+})
+
 
-def safe_query(model_class, **filters):
-    """Safely query database models with error handling"""
+def render_listing(request, listing):
     try:
-        return model_class.objects.filter(**filters)
+        results = {name: call() for name, call in listing.reads(request).items()}
+        return render(request, listing.template, listing.context(results))
     except Exception as e:
-        logger.error(f"Database error in {model_class.__name__}: {str(e)}")
-        return model_class.objects.none()
+        return listing_failed(request, listing, e)
 
 
+def listing_failed(request, listing, error):
+    """The degraded response of a listing whose reads or template failed"""
+    logger.error(f"Error in {listing.name} view: {str(error)}")
+    skip_page_cache(request)
+    prerendered = prerendered_page(request)
+    if prerendered is not None:
+        return prerendered
+    return render(request, listing.template, listing.fallback_context())
+
+
+@cache_public_page()
 def home(request):
     try:
         return render(request, "main/home.html")
     except Exception as e:
         logger.error(f"Error in home view: {str(e)}")
+        skip_page_cache(request)
+        prerendered = prerendered_page(request)
+        if prerendered is not None:
+            return prerendered
         # Return a simple response if template fails
         from django.http import HttpResponse
         return HttpResponse("Welcome to AI Solutions - Site is working!")
 
 
+@listing_condition(
+    Solution.objects.filter(is_active=True),
+    PricingPlan.objects.filter(is_active=True),
+)
+@cache_public_page(Solution, PricingPlan)
 def solutions(request):
-    try:
-        solutions = safe_query(Solution, is_active=True)
-        featured_solutions = solutions.filter(is_featured=True)
-        pricing_plans = safe_query(PricingPlan, is_active=True)
-        
-        context = {
-            'solutions': solutions,
-            'featured_solutions': featured_solutions,
-            'pricing_plans': pricing_plans,
-        }
-        return render(request, "main/solutions.html", context)
-    except Exception as e:
-        logger.error(f"Error in solutions view: {str(e)}")
-        return render(request, "main/solutions.html", {
-            'solutions': Solution.objects.none(),
-            'featured_solutions': Solution.objects.none(),
-            'pricing_plans': PricingPlan.objects.none(),
-        })
-
+    return render_listing(request, SOLUTIONS)
 
+@cache_public_page()
 def portfolio(request):
     try:
         return render(request, "main/portfolio.html")
     except Exception as e:
         logger.error(f"Error in portfolio view: {str(e)}")
+        skip_page_cache(request)
+        prerendered = prerendered_page(request)
+        if prerendered is not None:
+            return prerendered
         from django.http import HttpResponse
         return HttpResponse("Portfolio page - Template error, but Django is working!")
 
 
+@listing_condition(Testimonial.objects.filter(is_active=True))
+@cache_public_page(Testimonial)
 def testimonials(request):
-    try:
-        testimonials = safe_query(Testimonial, is_active=True)
-        featured_testimonials = testimonials.filter(is_featured=True)
-        
-        # Get industry statistics
-        industry_stats = {}
-        for industry, _ in Testimonial.INDUSTRY_CHOICES:
-            count = testimonials.filter(industry=industry).count()
-            if count > 0:
-                avg_rating = testimonials.filter(industry=industry).aggregate(
-                    avg_rating=models.Avg('rating')
-                )['avg_rating']
-                industry_stats[industry] = {
-                    'count': count,
-                    'avg_rating': round(avg_rating, 1)
-                }
-        
-        context = {
-            'testimonials': testimonials,
-            'featured_testimonials': featured_testimonials,
-            'industry_stats': industry_stats,
-        }
-        return render(request, "main/testimonials.html", context)
-    except Exception as e:
-        logger.error(f"Error in testimonials view: {str(e)}")
-        return render(request, "main/testimonials.html", {
-            'testimonials': Testimonial.objects.none(),
-            'featured_testimonials': Testimonial.objects.none(),
-            'industry_stats': {},
-        })
-
+    return render_listing(request, TESTIMONIALS)
 
+@listing_condition(Article.objects.filter(is_published=True))
+@cache_public_page(Article)
 def articles(request):
-    try:
-        articles = safe_query(Article, is_published=True)
-        featured_articles = articles.filter(is_featured=True)
-        
-        # Get category statistics
-        category_stats = {}
-        for category, _ in Article.CATEGORY_CHOICES:
-            count = articles.filter(category=category).count()
-            if count > 0:
-                category_stats[category] = count
-        
-        context = {
-            'articles': articles,
-            'featured_articles': featured_articles,
-            'category_stats': category_stats,
-        }
-        return render(request, "main/articles.html", context)
-    except Exception as e:
-        logger.error(f"Error in articles view: {str(e)}")
-        return render(request, "main/articles.html", {
-            'articles': Article.objects.none(),
-            'featured_articles': Article.objects.none(),
-            'category_stats': {},
-        })
+    return render_listing(request, ARTICLES)
+
+def article_detail(request, slug):
+    """Serve a published article, from the in-process LRU while the content version is unchanged"""
+    version = read('content_version', content_version, request)
+    entry = article_pages.get(slug)
+    if entry is None or entry[1] != version or has_pending_messages(request):
+        article = read(
+            ('article', slug),
+            partial(get_object_or_404, Article, slug=slug, is_published=True),
+            request,
+        )
+        response = render(request, "main/article_detail.html", {"article": article})
+        if has_pending_messages(request):
+            article_views.increment(article.pk)
+            return response
+        entry = (article.pk, version, response.content)
+        article_pages.set(slug, entry)
 
+    article_views.increment(entry[0])
+    return HttpResponse(entry[2])
 
-def gallery(request):
-    try:
-        images = safe_query(GalleryImage, is_active=True)
-        featured_images = images.filter(is_featured=True)
-        
-        context = {
-            "images": images,
-            "title": "Photo Gallery",  # 👈 Pass title here
-            "subtitle": "Promotional events and moments.",
-            "icon_class": "ri-gallery-line",
-        }
-        return render(request, "main/gallery.html", context)
-    except Exception as e:
-        logger.error(f"Error in gallery view: {str(e)}")
-        return render(request, "main/gallery.html", {
-            "images": GalleryImage.objects.none(),
-            "title": "Photo Gallery",
-            "subtitle": "Promotional events and moments.",
-            "icon_class": "ri-gallery-line",
-        })
 
+@listing_condition(GalleryImage.objects.all())
+@cache_public_page(GalleryImage)
+def gallery(request):
+    return render_listing(request, GALLERY)
 
+@listing_condition(Event.objects.filter(is_active=True), vary_on_csrf=True)
+@cache_public_page(Event, vary_on_csrf=True)
 def events(request):
+    return render_listing(request, EVENTS)
+
+def register_event(request, pk):
+    event = get_object_or_404(Event, pk=pk, is_active=True)
+    if request.method == "POST":
+        form = EventRegistrationForm(request.POST)
+        if form.is_valid():
+            try:
+                registration, created = register(event, **form.cleaned_data)
+            except SoldOut:
+                messages.error(request, "Sorry, this event is fully booked.")
+            else:
+                if registration.status == "waitlisted":
+                    messages.info(request, "The event is full, so you're on the waitlist. We'll be in touch if a seat opens up.")
+                else:
+                    messages.success(request, f"You're registered for {event.title}!")
+            return redirect(reverse("register_event", args=[event.pk]))
+    else:
+        form = EventRegistrationForm()
+    return render(request, "main/event_register.html", {"event": event, "form": form})
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()[:200]
     try:
-        events = safe_query(Event, is_active=True)
-        featured_events = events.filter(is_featured=True)
-        
-        # Get event type statistics
-        event_type_stats = {}
-        for event_type, _ in Event.EVENT_TYPE_CHOICES:
-            count = events.filter(event_type=event_type).count()
-            if count > 0:
-                event_type_stats[event_type] = count
-        
-        context = {
-            'events': events,
-            'featured_events': featured_events,
-            'event_type_stats': event_type_stats,
-        }
-        return render(request, "main/events.html", context)
+        results = search_objects(query) if query else []
     except Exception as e:
-        logger.error(f"Error in events view: {str(e)}")
-        return render(request, "main/events.html", {
-            'events': Event.objects.none(),
-            'featured_events': Event.objects.none(),
-            'event_type_stats': {},
-        })
+        logger.error(f"Error in search view: {str(e)}")
+        results = []
+    return render(request, "main/search.html", {
+        "query": query,
+        "results": results,
+        "title": "Search",
+        "icon_class": "ri-search-line",
+    })
 
 
 def contact(request):
     if request.method == "POST":
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            save_inquiry(form)
             messages.success(request, "Thank you! We'll get back to you shortly.")
             return redirect(reverse("contact"))
     else:
@@ -185,20 +256,32 @@ def contact(request):
     return render(request, "main/contact.html", {"form": form})
 
 
+def dashboard_reads():
+    """``{context name: callable}`` of the dashboard's independent reads"""
+    return {"summary": inquiry_summary, "recent_inquiries": lambda: list(Inquiry.objects.all()[:10])}
+
+
+def dashboard_context(results):
+    return {"total_inquiries": results["summary"]["total"], **results}
+
+
+DASHBOARD_FALLBACK = {"total_inquiries": 0, "summary": None, "recent_inquiries": []}
+
+
 @login_required
 def admin_dashboard(request):
     try:
-        total_inquiries = Inquiry.objects.count()
-        recent_inquiries = Inquiry.objects.all()[:10]
-        return render(
-            request,
-            "main/admin_dashboard.html",
-            {"total_inquiries": total_inquiries, "recent_inquiries": recent_inquiries},
-        )
+        context = dashboard_context({name: call() for name, call in dashboard_reads().items()})
     except Exception as e:
         logger.error(f"Error in admin_dashboard view: {str(e)}")
-        return render(
-            request,
-            "main/admin_dashboard.html",
-            {"total_inquiries": 0, "recent_inquiries": Inquiry.objects.none()},
-        )
+        context = DASHBOARD_FALLBACK
+    return render(request, "main/admin_dashboard.html", context)
+
+
+@login_required
+def export_inquiries(request):
+    fmt = request.GET.get("format", "csv")
+    if fmt not in CONTENT_TYPES:
+        return HttpResponse(f"Unsupported export format: {fmt}", status=400, content_type="text/plain")
+    queryset = filter_inquiries(Inquiry.objects.all(), request.GET)
+    return export_response(queryset, fmt)